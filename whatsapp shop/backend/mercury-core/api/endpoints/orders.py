@@ -17,6 +17,9 @@ from ...utils.logger import logger
 
 router = APIRouter()
 
+# Columns an OrderUpdate may write; computed once rather than checked per request
+ALLOWED_ORDER_UPDATE_FIELDS = frozenset(OrderUpdate.model_fields) & frozenset(Order.__table__.columns.keys())
+
 def convert_to_response(order: Order) -> OrderResponse:
     """Convert database model to response schema"""
     return OrderResponse(
@@ -47,7 +50,7 @@ def convert_to_response(order: Order) -> OrderResponse:
     )
 
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-async def create_order(
+def create_order(
     order_data: OrderCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
@@ -69,7 +72,7 @@ async def create_order(
         )
 
 @router.get("/{order_id}", response_model=OrderResponse)
-async def get_order(
+def get_order(
     order_id: str,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user),
@@ -95,7 +98,7 @@ async def get_order(
     return convert_to_response(order)
 
 @router.get("/", response_model=OrderListResponse)
-async def list_orders(
+def list_orders(
     skip: int = 0,
     limit: int = 100,
     status: Optional[OrderStatus] = None,
@@ -123,7 +126,7 @@ async def list_orders(
         customer_id=customer_id
     )
     
-    total = db.query(Order).count()
+    total = order_service.count_orders(status=status, customer_id=customer_id)
     
     return {
         "items": [convert_to_response(order) for order in orders],
@@ -133,7 +136,7 @@ async def list_orders(
     }
 
 @router.patch("/{order_id}/status", response_model=OrderResponse)
-async def update_order_status(
+def update_order_status(
     order_id: str,
     status_update: OrderStatusUpdate,
     db: Session = Depends(get_db),
@@ -167,7 +170,7 @@ async def update_order_status(
         )
 
 @router.patch("/{order_id}", response_model=OrderResponse)
-async def update_order(
+def update_order(
     order_id: str,
     order_data: OrderUpdate,
     db: Session = Depends(get_db),
@@ -197,11 +200,11 @@ async def update_order(
         # Update order fields
         update_data = order_data.dict(exclude_unset=True)
         for field, value in update_data.items():
-            setattr(db_order, field, value)
+            if field in ALLOWED_ORDER_UPDATE_FIELDS:
+                setattr(db_order, field, value)
             
         db_order.updated_by = current_user.id
         db.commit()
-        db.refresh(db_order)
         
         return convert_to_response(db_order)
         
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
@@ -13,7 +13,7 @@ from services.account import AccountService
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
 @router.post("/", response_model=AccountSchema, status_code=status.HTTP_201_CREATED)
-async def create_account(
+def create_account(
     account: AccountCreate,
     db: Session = Depends(get_db)
 ):
@@ -27,9 +27,11 @@ async def create_account(
         raise HTTPException(status_code=500, detail=f"Failed to create account: {str(e)}")
 
 @router.get("/", response_model=List[AccountSchema])
-async def list_accounts(
+def list_accounts(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[int] = Query(None, description="Last account id from the previous page"),
     account_type: Optional[AccountType] = None,
     is_active: Optional[bool] = None,
     search: Optional[str] = None,
@@ -37,20 +39,25 @@ async def list_accounts(
 ):
     """List accounts with optional filters"""
     try:
+        # Fetch one extra row to know whether another page exists
         accounts = AccountService.get_accounts(
             db=db,
             skip=skip,
-            limit=limit,
+            limit=limit + 1,
             account_type=account_type,
             is_active=is_active,
-            search=search
+            search=search,
+            cursor=cursor
         )
+        if len(accounts) > limit:
+            accounts = accounts[:limit]
+            response.headers["X-Next-Cursor"] = str(accounts[-1].id)
         return [AccountSchema.from_orm(account) for account in accounts]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list accounts: {str(e)}")
 
 @router.get("/{account_id}", response_model=AccountSchema)
-async def get_account(
+def get_account(
     account_id: str,
     db: Session = Depends(get_db)
 ):
@@ -61,7 +68,7 @@ async def get_account(
     return AccountSchema.from_orm(account)
 
 @router.put("/{account_id}", response_model=AccountSchema)
-async def update_account(
+def update_account(
     account_id: str,
     account_update: AccountUpdate,
     db: Session = Depends(get_db)
@@ -76,7 +83,7 @@ async def update_account(
         raise HTTPException(status_code=500, detail=f"Failed to update account: {str(e)}")
 
 @router.delete("/{account_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_account(
+def delete_account(
     account_id: str,
     db: Session = Depends(get_db)
 ):
@@ -91,7 +98,7 @@ async def delete_account(
         raise HTTPException(status_code=500, detail=f"Failed to delete account: {str(e)}")
 
 @router.get("/{account_id}/balance")
-async def get_account_balance(
+def get_account_balance(
     account_id: str,
     db: Session = Depends(get_db)
 ):
@@ -105,7 +112,7 @@ async def get_account_balance(
         raise HTTPException(status_code=500, detail=f"Failed to get account balance: {str(e)}")
 
 @router.get("/balances/all", response_model=List[AccountBalance])
-async def get_all_account_balances(db: Session = Depends(get_db)):
+def get_all_account_balances(db: Session = Depends(get_db)):
     """Get balances for all active accounts"""
     try:
         balances = AccountService.get_all_account_balances(db)
@@ -114,7 +121,7 @@ async def get_all_account_balances(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get account balances: {str(e)}")
 
 @router.get("/trial-balance/summary")
-async def get_trial_balance(db: Session = Depends(get_db)):
+def get_trial_balance(db: Session = Depends(get_db)):
     """Generate trial balance"""
     try:
         trial_balance = AccountService.get_trial_balance(db)
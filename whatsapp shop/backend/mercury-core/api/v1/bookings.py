@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from typing import List
 from sqlalchemy.orm import Session
-from app.schemas.booking import BookingCreate, BookingResponse, BookingList
+from app.schemas.booking import BookingCreate, BookingResponse, BookingList, BOOKING_LIST_ADAPTER
+from app.schemas._stream import iter_json_list
 from app.services.booking_service import BookingService
 from app.db.session import get_db
 from app.core.auth import get_current_user
@@ -9,7 +11,7 @@ from app.core.auth import get_current_user
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
-async def create_booking(
+def create_booking(
     booking_in: BookingCreate,
     db: Session = Depends(get_db),
     current_user: dict = Depends(get_current_user)
@@ -18,12 +20,13 @@ async def create_booking(
     return booking
 
 @router.get("/", response_model=List[BookingResponse])
-async def list_bookings(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
+def list_bookings(skip: int = 0, limit: int = 50, db: Session = Depends(get_db)):
     bookings = BookingService.list_bookings(db, skip=skip, limit=limit)
-    return bookings
+    items = BOOKING_LIST_ADAPTER.validate_python(bookings, from_attributes=True)
+    return StreamingResponse(iter_json_list(BOOKING_LIST_ADAPTER, items), media_type="application/json")
 
 @router.get("/{booking_id}", response_model=BookingResponse)
-async def get_booking(booking_id: int, db: Session = Depends(get_db)):
+def get_booking(booking_id: int, db: Session = Depends(get_db)):
     booking = BookingService.get_booking(db, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
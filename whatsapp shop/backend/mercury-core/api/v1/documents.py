@@ -12,6 +12,9 @@ from app.models.user import User
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
+# Columns a DocumentUpdate may write; other payload keys have nowhere to go
+ALLOWED_DOCUMENT_UPDATE_FIELDS = frozenset(DocumentUpdate.model_fields) & frozenset(Document.__table__.columns.keys())
+
 @router.get("/", response_model=List[dict])
 async def get_documents(
     skip: int = 0,
@@ -57,7 +60,6 @@ async def create_document(
     )
     db.add(db_document)
     db.commit()
-    db.refresh(db_document)
     
     return {
         "id": db_document.id,
@@ -102,10 +104,10 @@ async def update_document(
     
     # Update fields
     for field, value in document_update.dict(exclude_unset=True).items():
-        setattr(document, field, value)
+        if field in ALLOWED_DOCUMENT_UPDATE_FIELDS:
+            setattr(document, field, value)
     
     db.commit()
-    db.refresh(document)
     
     return {
         "id": document.id,
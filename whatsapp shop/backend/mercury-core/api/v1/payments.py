@@ -11,21 +11,21 @@ from services.payment import PaymentService
 router = APIRouter(prefix="/payments", tags=["payments"])
 
 @router.post("/", response_model=PaymentSchema, status_code=status.HTTP_201_CREATED)
-async def create_payment(
+def create_payment(
     payment: PaymentCreate,
     db: Session = Depends(get_db)
 ):
     """Create a new payment"""
     try:
         db_payment = PaymentService.create_payment(db, payment)
-        return PaymentSchema.from_orm(db_payment)
+        return PaymentSchema.model_validate(db_payment)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create payment: {str(e)}")
 
 @router.get("/", response_model=List[PaymentSchema])
-async def list_payments(
+def list_payments(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     order_id: Optional[int] = None,
@@ -47,12 +47,12 @@ async def list_payments(
             start_date=start_date,
             end_date=end_date
         )
-        return [PaymentSchema.from_orm(payment) for payment in payments]
+        return [PaymentSchema.model_validate(payment) for payment in payments]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list payments: {str(e)}")
 
 @router.get("/{payment_id}", response_model=PaymentSchema)
-async def get_payment(
+def get_payment(
     payment_id: str,
     db: Session = Depends(get_db)
 ):
@@ -60,10 +60,10 @@ async def get_payment(
     payment = PaymentService.get_payment(db, payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
-    return PaymentSchema.from_orm(payment)
+    return PaymentSchema.model_validate(payment)
 
 @router.put("/{payment_id}", response_model=PaymentSchema)
-async def update_payment(
+def update_payment(
     payment_id: str,
     payment_update: PaymentUpdate,
     db: Session = Depends(get_db)
@@ -71,14 +71,14 @@ async def update_payment(
     """Update a payment"""
     try:
         db_payment = PaymentService.update_payment(db, payment_id, payment_update)
-        return PaymentSchema.from_orm(db_payment)
+        return PaymentSchema.model_validate(db_payment)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update payment: {str(e)}")
 
 @router.delete("/{payment_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_payment(
+def delete_payment(
     payment_id: str,
     db: Session = Depends(get_db)
 ):
@@ -93,7 +93,7 @@ async def delete_payment(
         raise HTTPException(status_code=500, detail=f"Failed to delete payment: {str(e)}")
 
 @router.get("/stats/summary")
-async def get_payment_stats(db: Session = Depends(get_db)):
+def get_payment_stats(db: Session = Depends(get_db)):
     """Get payment statistics"""
     try:
         stats = PaymentService.get_payment_stats(db)
@@ -102,13 +102,13 @@ async def get_payment_stats(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to get payment stats: {str(e)}")
 
 @router.get("/order/{order_id}", response_model=List[PaymentSchema])
-async def get_payments_by_order(
+def get_payments_by_order(
     order_id: int,
     db: Session = Depends(get_db)
 ):
     """Get all payments for an order"""
     try:
         payments = PaymentService.get_payments_by_order(db, order_id)
-        return [PaymentSchema.from_orm(payment) for payment in payments]
+        return [PaymentSchema.model_validate(payment) for payment in payments]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get payments for order: {str(e)}")
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.db.session import get_db
 from models.product import Product, ProductType
-from schemas.product import ProductCreate, ProductUpdate, Product as ProductSchema
+from schemas.product import ProductCreate, ProductUpdate, Product as ProductSchema, PRODUCT_LIST_ADAPTER
+from schemas._stream import iter_json_list
 from services.product import ProductService
 
 router = APIRouter(prefix="/products", tags=["products"])
@@ -50,7 +52,8 @@ async def list_products(
             skip=skip,
             limit=limit
         )
-        return [ProductSchema.from_orm(product) for product in products]
+        items = PRODUCT_LIST_ADAPTER.validate_python(products, from_attributes=True)
+        return StreamingResponse(iter_json_list(PRODUCT_LIST_ADAPTER, items), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list products: {str(e)}")
 
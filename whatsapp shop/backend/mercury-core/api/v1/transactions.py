@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
 
 from app.db.session import get_db
 from models.transaction import Transaction, TransactionType
-from schemas.transaction import Transaction as TransactionSchema
+from schemas.transaction import Transaction as TransactionSchema, TRANSACTION_LIST_ADAPTER
+from schemas._stream import iter_json_list
 from services.transaction import TransactionService
 from models.transaction import Transaction, TransactionType
 from schemas.transaction import Transaction as TransactionSchema
@@ -38,7 +40,8 @@ async def list_transactions(
             start_date=start_date,
             end_date=end_date
         )
-        return [TransactionSchema.from_orm(transaction) for transaction in transactions]
+        items = TRANSACTION_LIST_ADAPTER.validate_python(transactions, from_attributes=True)
+        return StreamingResponse(iter_json_list(TRANSACTION_LIST_ADAPTER, items), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list transactions: {str(e)}")
 
@@ -51,7 +54,7 @@ async def get_transaction(
     transaction = TransactionService.get_transaction(db, transaction_id)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
-    return TransactionSchema.from_orm(transaction)
+    return TransactionSchema.model_validate(transaction)
 
 @router.get("/journal/{journal_entry_id}", response_model=List[TransactionSchema])
 async def get_transactions_by_journal_entry(
@@ -61,7 +64,8 @@ async def get_transactions_by_journal_entry(
     """Get all transactions for a journal entry"""
     try:
         transactions = TransactionService.get_transactions_by_journal_entry(db, journal_entry_id)
-        return [TransactionSchema.from_orm(transaction) for transaction in transactions]
+        items = TRANSACTION_LIST_ADAPTER.validate_python(transactions, from_attributes=True)
+        return StreamingResponse(iter_json_list(TRANSACTION_LIST_ADAPTER, items), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get transactions for journal entry: {str(e)}")
 
@@ -79,7 +83,8 @@ async def get_transactions_by_account(
         transactions = TransactionService.get_transactions_by_account(
             db, account_id, start_date, end_date, skip, limit
         )
-        return [TransactionSchema.from_orm(transaction) for transaction in transactions]
+        items = TRANSACTION_LIST_ADAPTER.validate_python(transactions, from_attributes=True)
+        return StreamingResponse(iter_json_list(TRANSACTION_LIST_ADAPTER, items), media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get transactions for account: {str(e)}")
 
@@ -41,7 +41,6 @@ async def register(
     
     db.add(db_user)
     db.commit()
-    db.refresh(db_user)
     
     return db_user
 
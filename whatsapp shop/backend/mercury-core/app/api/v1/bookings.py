@@ -105,7 +105,6 @@ async def create_booking(
         
         db.add(db_booking)
         db.commit()
-        db.refresh(db_booking)
         
         return db_booking
         
@@ -207,6 +206,5 @@ async def cancel_booking(
     booking.updated_at = datetime.utcnow()
     
     db.commit()
-    db.refresh(booking)
     
     return booking
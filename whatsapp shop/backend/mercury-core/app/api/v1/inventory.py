@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
@@ -17,7 +18,7 @@ class MovementResponse(BaseModel):
     notes: Optional[str]
     unit_cost: Optional[float]
     performed_by: Optional[str]
-    created_at: Optional[str]
+    created_at: Optional[datetime]
 
     class Config:
         orm_mode = True
@@ -47,8 +48,11 @@ def get_product_stock(product_id: int, db=Depends(get_db), current_user: User =
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
 
 @router.get("/inventory/movements/", response_model=List[MovementResponse])
-def list_movements(product_id: int, skip: int = 0, limit: int = 50, db=Depends(get_db), current_user: User = Depends(get_current_user)):
-    movements = InventoryService.get_product_movements(db, product_id, skip=skip, limit=limit)
+def list_movements(product_id: int, before_created_at: Optional[datetime] = None, before_id: Optional[int] = None,
+                   limit: int = 50, db=Depends(get_db), current_user: User = Depends(get_current_user)):
+    # Keyset paging: pass the created_at and id of the last movement received
+    cursor = (before_created_at, before_id) if before_created_at and before_id else None
+    movements = InventoryService.get_product_movements(db, product_id, cursor=cursor, limit=limit)
     return movements
 
 @router.post("/inventory/movements/adjust", response_model=MovementResponse)
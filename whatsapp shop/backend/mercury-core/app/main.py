@@ -1,10 +1,13 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from anyio import to_thread
 
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.db.init import init_db
+from app.db.session import SessionScoped, request_scope
+from app.services.calendar import CalendarService
 from api.api_router import api_router
 
 # Import all models early to ensure they are registered with SQLAlchemy
@@ -28,7 +31,14 @@ logger = setup_logging()
 async def lifespan(app: FastAPI):
     logger.info("Starting Mercury Commerce Platform")
     await init_db()
+    # Sync endpoints run in anyio's worker threads; no more of them than the DB pool
+    # can serve, so a request waits for a thread rather than blocking on checkout
+    to_thread.current_default_thread_limiter().total_tokens = (
+        settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    )
+    CalendarService.open_client()
     yield
+    await CalendarService.close_client()
     logger.info("Shutting down Mercury Commerce Platform")
 
 app = FastAPI(
@@ -44,8 +54,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset paging cursor for list endpoints; browsers hide it from JS otherwise
+    expose_headers=["X-Next-Cursor"],
 )
 
+@app.middleware("http")
+async def db_session_scope(request: Request, call_next):
+    """Give each request its own scoped DB session and release it afterwards"""
+    token = request_scope.set(object())
+    try:
+        return await call_next(request)
+    finally:
+        SessionScoped.remove()
+        request_scope.reset(token)
+
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/health")
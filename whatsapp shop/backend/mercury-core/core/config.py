@@ -27,6 +27,13 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "mercury_commerce"
     POSTGRES_PORT: int = 5432
     
+    # Connection pool, per worker process; keep
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under Postgres max_connections
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
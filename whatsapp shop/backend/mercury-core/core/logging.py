@@ -1,7 +1,12 @@
 import logging
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+# Every module calls this at import time; only the first call configures
+# logging. Without the cache each call opened a new FileHandler that
+# basicConfig then ignored.
+@lru_cache(maxsize=1)
 def setup_logging():
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
@@ -0,0 +1,80 @@
+"""
+Bulk INSERT helpers; large batches on PostgreSQL are streamed in with COPY.
+"""
+import io
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import Table, insert
+from sqlalchemy.orm import Session
+
+# Below this many rows a multi-row INSERT is about as quick as COPY
+COPY_THRESHOLD = 100
+
+
+def _column_defaults(table: Table, present) -> Dict[str, Any]:
+    """Python-side defaults for columns the rows leave out; COPY won't apply them"""
+    defaults = {}
+    for column in table.columns:
+        default = column.default
+        if column.name in present or default is None:
+            continue
+        if default.is_scalar:
+            defaults[column.name] = default.arg
+        elif default.is_callable:
+            defaults[column.name] = default.arg(None)
+    return defaults
+
+
+def _csv_field(value) -> str:
+    # In COPY's CSV format an unquoted empty field is NULL, so quote everything else
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_buffer(table: Table, rows: List[Dict[str, Any]], dialect) -> Tuple[io.StringIO, List[str]]:
+    """Encode rows as COPY CSV, passing each value through its column's bind processor"""
+    columns = list(rows[0])
+    # The column list comes from the first row, so every row has to carry the same keys
+    keys = set(columns)
+    for index, row in enumerate(rows):
+        if row.keys() != keys:
+            raise ValueError(f"Row {index} has columns {sorted(row)}, expected {sorted(keys)}")
+    defaults = _column_defaults(table, columns)
+    columns += list(defaults)
+    processors = [table.c[name].type.bind_processor(dialect) for name in columns]
+
+    buffer = io.StringIO()
+    for row in rows:
+        fields = []
+        for name, process in zip(columns, processors):
+            value = row[name] if name in row else defaults[name]
+            if process is not None and value is not None:
+                value = process(value)
+            fields.append(_csv_field(value))
+        buffer.write(",".join(fields))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer, columns
+
+
+def bulk_insert(db: Session, model, rows: List[Dict[str, Any]]) -> None:
+    """INSERT rows in the session's transaction; COPY for large PostgreSQL batches"""
+    if not rows:
+        return
+    connection = db.connection()
+    if len(rows) < COPY_THRESHOLD or connection.dialect.driver != "psycopg2":
+        db.execute(insert(model), rows)
+        return
+
+    table = model.__table__
+    buffer, columns = _copy_buffer(table, rows, connection.dialect)
+    preparer = connection.dialect.identifier_preparer
+    statement = "COPY {} ({}) FROM STDIN WITH (FORMAT csv)".format(
+        preparer.format_table(table), ", ".join(preparer.quote(name) for name in columns)
+    )
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(statement, buffer)
+    finally:
+        cursor.close()
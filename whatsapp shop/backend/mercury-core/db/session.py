@@ -1,17 +1,31 @@
+from contextvars import ContextVar
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
+from typing import Generator, Optional
 
 from app.core.config import settings
 
 engine = create_engine(
     settings.DATABASE_URL,
+    # Drop connections closed by PgBouncer/idle timeouts before handing them out
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay loaded after commit so handlers can return what they just wrote
+# without a reload; code that changes rows in bulk SQL expires them explicitly
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Marks the current request; set by the app middleware. Scoping on this rather than
+# the thread keeps concurrent async requests on the event loop from sharing a session
+request_scope: ContextVar[Optional[object]] = ContextVar("db_request_scope", default=None)
+
+# One session per request, shared by everything that asks for it and removed by the
+# middleware when the response is done
+SessionScoped = scoped_session(SessionLocal, scopefunc=request_scope.get)
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -1,7 +1,7 @@
 from minio import Minio
 from minio.error import S3Error
 from datetime import timedelta
-from typing import Optional
+from typing import Optional, Union
 import io
 
 from app.core.config import settings
@@ -40,17 +40,24 @@ class MinIOStorage:
         self,
         bucket: str,
         object_name: str,
-        data: bytes,
+        data: Union[bytes, io.BytesIO],
         content_type: str = "application/octet-stream"
     ) -> str:
-        """Upload file to MinIO"""
+        """Upload bytes or an in-memory stream to MinIO"""
+        
+        if isinstance(data, io.BytesIO):
+            # Upload the buffer as-is rather than copying it out with read()
+            stream, length = data, data.getbuffer().nbytes
+            stream.seek(0)
+        else:
+            stream, length = io.BytesIO(data), len(data)
         
         try:
             self.client.put_object(
                 bucket,
                 object_name,
-                io.BytesIO(data),
-                len(data),
+                stream,
+                length,
                 content_type=content_type
             )
             
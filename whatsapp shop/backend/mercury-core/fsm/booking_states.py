@@ -15,10 +15,15 @@ BOOKING_STATE_TRANSITIONS = {
     BookingStatus.NO_SHOW: []
 }
 
+# Same precomputed lookups as fsm.order_states
+_BOOKING_TERMINALS = frozenset(s for s, allowed in BOOKING_STATE_TRANSITIONS.items() if not allowed)
+_BOOKING_EDGES = {s: frozenset(allowed) for s, allowed in BOOKING_STATE_TRANSITIONS.items()}
+
 def can_transition_booking(from_state: BookingStatus, to_state: BookingStatus) -> bool:
     """Check if booking transition is valid"""
-    allowed = BOOKING_STATE_TRANSITIONS.get(from_state, [])
-    return to_state in allowed
+    if from_state in _BOOKING_TERMINALS:
+        return False
+    return to_state in _BOOKING_EDGES.get(from_state, ())
 
 def get_allowed_booking_transitions(current_state: BookingStatus) -> list:
     """Get all allowed transitions from current booking state"""
@@ -30,10 +30,16 @@ ORDER_STATE_TRANSITIONS = {
     OrderStatus.EXPIRED: []
 }
 
+# Precomputed lookups: terminal states have no outgoing edges, so they can be
+# rejected with a single set probe before touching the transition table
+_ORDER_TERMINALS = frozenset(s for s, allowed in ORDER_STATE_TRANSITIONS.items() if not allowed)
+_ORDER_EDGES = {s: frozenset(allowed) for s, allowed in ORDER_STATE_TRANSITIONS.items()}
+
 def can_transition(from_state: OrderStatus, to_state: OrderStatus) -> bool:
     """Check if transition is valid"""
-    allowed = ORDER_STATE_TRANSITIONS.get(from_state, [])
-    return to_state in allowed
+    if from_state in _ORDER_TERMINALS:
+        return False
+    return to_state in _ORDER_EDGES.get(from_state, ())
 
 def get_allowed_transitions(current_state: OrderStatus) -> list:
     """Get all allowed transitions from current state"""
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Enum as SQLEnum, Text, Numeric
+from sqlalchemy import Column, String, Integer, ForeignKey, Enum as SQLEnum, Text, Numeric, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -13,7 +13,11 @@ class MovementType(str, enum.Enum):
 
 class InventoryMovement(BaseModel):
     __tablename__ = "inventory_movements"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Newest-first movement history per product, paged by (created_at, id)
+        Index('ix_movements_product_created', 'product_id', 'created_at', 'id'),
+        {'extend_existing': True},
+    )
     
     
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
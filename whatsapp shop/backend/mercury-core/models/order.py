@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Enum as SQLEnum, Numeric, Text, DateTime, JSON
+from sqlalchemy import Column, String, Integer, ForeignKey, Enum as SQLEnum, Numeric, Text, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -23,10 +23,12 @@ class OrderSource(str, enum.Enum):
 
 class Order(BaseModel):
     __tablename__ = "orders"
-    __table_args__ = {'extend_existing': True}
     
     
     order_number = Column(String(50), unique=True, index=True, nullable=False)
+    
+    # Optimistic locking: UPDATEs are guarded on this and it bumps on every write
+    version_id = Column(Integer, nullable=False, default=1)
     customer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Status
@@ -57,6 +59,22 @@ class Order(BaseModel):
     notes = Column(Text)
     metadata_json = Column(JSON, default=dict)
     
+    __mapper_args__ = {"version_id_col": version_id}
+    
+    # Partial index for the expiry sweep: only orders still awaiting payment
+    # are indexed, so the scan tracks pending work rather than order history
+    _expirable = status.in_([OrderStatus.PENDING_PAYMENT, OrderStatus.PAYMENT_SUBMITTED])
+    __table_args__ = (
+        Index('ix_orders_expirable_expires_at', expires_at, postgresql_where=_expirable,
+              sqlite_where=_expirable, postgresql_include=['status']),
+        # Newest-first order history per customer, paged by (created_at, id)
+        Index('ix_orders_customer_created', customer_id, 'created_at', 'id'),
+        # Sales report and dashboard revenue over created_at ranges, index-only
+        Index('ix_orders_created_at', 'created_at', postgresql_include=['total_amount']),
+        {'extend_existing': True},
+    )
+    del _expirable
+    
     # Relationships
     # customer = relationship("models.user.User", back_populates="orders")  # Commented out to avoid dependency issue
     # items = relationship("models.order_item.OrderItem", back_populates="order", cascade="all, delete-orphan")  # Commented out to avoid dependency issue
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, String, Enum as SQLEnum, DateTime, Text
+from sqlalchemy import Column, Integer, ForeignKey, Numeric, String, Enum as SQLEnum, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 import enum
 
@@ -18,7 +18,11 @@ class PaymentMethod(str, enum.Enum):
 
 class Payment(BaseModel):
     __tablename__ = "payments"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Payment report over created_at ranges
+        Index('ix_payments_created_at', 'created_at'),
+        {'extend_existing': True},
+    )
     
     
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Numeric, Integer, Boolean, Text, Enum as SQLEnum, JSON, Float, ForeignKey
+from sqlalchemy import Column, String, Numeric, Integer, Boolean, Text, Enum as SQLEnum, JSON, Float, ForeignKey, CheckConstraint, Index, text, and_, func, literal_column
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 import enum
 import uuid
@@ -12,7 +13,14 @@ class ProductType(str, enum.Enum):
 
 class Product(BaseModel):
     __tablename__ = "products"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Last line of defence for the stock guards in the inventory services
+        CheckConstraint('stock_quantity >= 0', name='ck_product_stock_nonneg'),
+        # Low-stock checks (Product.is_low_stock) only look at products with a reorder level above 0
+        Index('ix_products_reorder', 'stock_quantity', 'reorder_level',
+              postgresql_where=text('reorder_level > 0'), sqlite_where=text('reorder_level > 0')),
+        {'extend_existing': True},
+    )
     
     
     name = Column(String(200), nullable=False, index=True)
@@ -54,6 +62,16 @@ class Product(BaseModel):
     metadata_json = Column(JSON, default=dict)
     image_url = Column(String(500))
     
+    @hybrid_property
+    def is_low_stock(self):
+        """At or below the reorder level; a reorder level of 0 means no alerts"""
+        return (self.reorder_level or 0) > 0 and (self.stock_quantity or 0) <= self.reorder_level
+    
+    @is_low_stock.expression
+    def is_low_stock(cls):
+        # Inline 0 rather than a bound parameter so the planner can match ix_products_reorder
+        return and_(cls.reorder_level > literal_column("0"), func.coalesce(cls.stock_quantity, 0) <= cls.reorder_level)
+    
     # Relationships
     # order_items = relationship("models.order_item.OrderItem", back_populates="product")  # Commented out to avoid circular dependency
     # inventory_movements = relationship("models.inventory.InventoryMovement", back_populates="product")  # Commented out to avoid dependency issue
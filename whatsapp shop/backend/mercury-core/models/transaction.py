@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Numeric, DateTime, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, ForeignKey, String, Numeric, DateTime, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import enum
 from datetime import datetime
@@ -11,7 +11,17 @@ class TransactionType(str, enum.Enum):
 
 class Transaction(BaseModel):
     __tablename__ = "transactions"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Covers the per-account debit/credit SUMs (balances, trial balance)
+        # so they can be answered from the index alone
+        Index('ix_tx_account_type_amount', 'account_id', 'transaction_type', postgresql_include=['amount']),
+        # Period sums per account and side (P&L), again without touching the heap
+        Index('ix_tx_account_type_date', 'account_id', 'transaction_type', 'transaction_date',
+              postgresql_include=['amount']),
+        # Date-range listings that aren't restricted to one account
+        Index('ix_tx_date', 'transaction_date'),
+        {'extend_existing': True},
+    )
     
     
     journal_entry_id = Column(String(50), index=True, nullable=False)
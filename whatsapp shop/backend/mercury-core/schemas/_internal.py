@@ -0,0 +1,17 @@
+"""Lightweight internal carriers used inside services.
+
+TransactionLineItemDC mirrors TransactionLineItem but skips pydantic
+entirely, so the accounting service can build journal lines cheaply.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True, frozen=True)
+class TransactionLineItemDC:
+    account_id: int
+    amount: float
+    is_debit: bool
+    description: Optional[str] = None
+    reference_id: Optional[str] = None
+    reference_type: Optional[str] = None
@@ -0,0 +1,21 @@
+from typing import Iterator, Sequence
+
+from pydantic import TypeAdapter
+
+# Items serialized per chunk; keeps the working buffer bounded for large lists
+STREAM_CHUNK_SIZE = 500
+
+
+def _iter_items(adapter: TypeAdapter, items: Sequence, chunk_size: int) -> Iterator[bytes]:
+    for start in range(0, len(items), chunk_size):
+        if start:
+            yield b","
+        # dump_json gives b"[...]"; strip the brackets so chunks splice together
+        yield adapter.dump_json(items[start:start + chunk_size])[1:-1]
+
+
+def iter_json_list(adapter: TypeAdapter, items: Sequence, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a JSON array of items in chunks"""
+    yield b"["
+    yield from _iter_items(adapter, items, chunk_size)
+    yield b"]"
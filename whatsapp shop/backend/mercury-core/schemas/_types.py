@@ -0,0 +1,24 @@
+from typing import Annotated, Any, Dict
+
+from pydantic import Field, WrapValidator
+
+
+def _passthrough_object(value, handler):
+    # Plain dicts are stored as-is in JSON columns; only fall back to full
+    # validation for anything else so non-objects are still rejected.
+    return value if type(value) is dict else handler(value)
+
+
+# Free-form JSON object (metadata, theme, template data, ...). Pydantic would
+# otherwise walk and copy the whole nested structure on every validation.
+JSONObject = Annotated[Dict[str, Any], WrapValidator(_passthrough_object)]
+
+# Shared constrained types. Declaring each constraint once lets every model
+# reuse the same schema node instead of carrying its own copy per field.
+CurrencyCode = Annotated[str, Field(min_length=3, max_length=3)]
+Name100 = Annotated[str, Field(max_length=100)]
+Title200 = Annotated[str, Field(max_length=200)]
+Amount = Annotated[float, Field(gt=0)]
+NonNegativeAmount = Annotated[float, Field(ge=0)]
+PositiveQty = Annotated[float, Field(gt=0)]
+TaxRate = Annotated[float, Field(ge=0, le=100)]
@@ -3,6 +3,8 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.schemas._types import Name100
+
 class AccountType(str, Enum):
     ASSET = "asset"
     LIABILITY = "liability"
@@ -41,7 +43,7 @@ class AccountSubType(str, Enum):
     DEPRECIATION = "depreciation"
 
 class AccountBase(BaseModel):
-    name: str = Field(..., max_length=100)
+    name: Name100
     code: str = Field(..., max_length=20)
     account_type: AccountType
     account_subtype: Optional[AccountSubType] = None
@@ -54,7 +56,7 @@ class AccountCreate(AccountBase):
     pass
 
 class AccountUpdate(BaseModel):
-    name: Optional[str] = Field(None, max_length=100)
+    name: Optional[Name100] = None
     code: Optional[str] = Field(None, max_length=20)
     account_type: Optional[AccountType] = None
     account_subtype: Optional[AccountSubType] = None
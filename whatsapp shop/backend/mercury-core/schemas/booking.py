@@ -1,7 +1,8 @@
 from datetime import datetime
 from enum import Enum
 from typing import Optional, List
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
 
 class BookingStatus(str, Enum):
     PENDING = "pending"
@@ -28,14 +29,14 @@ class BookingUpdate(BaseModel):
     notes: Optional[str] = None
 
 class BookingResponse(BookingBase):
-    id: str
+    id: int
     created_at: datetime
     updated_at: datetime
     calendar_event_id: Optional[str] = None
-    meeting_link: Optional[HttpUrl] = None
+    # Read-side: the link was produced by the calendar integration, not user input
+    meeting_link: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
 
 class BookingList(BaseModel):
     items: List[BookingResponse]
@@ -43,3 +44,7 @@ class BookingList(BaseModel):
     page: int
     size: int
     pages: int
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
+
+BOOKING_LIST_ADAPTER = TypeAdapter(List[BookingResponse])
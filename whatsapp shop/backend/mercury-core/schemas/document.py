@@ -1,8 +1,10 @@
 from enum import Enum
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, HttpUrl
+from typing import Optional, List
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
+from app.schemas._types import JSONObject, Name100, Title200
+
 class DocumentType(str, Enum):
     INVOICE = "invoice"
     RECEIPT = "receipt"
@@ -23,7 +25,7 @@ class DocumentStatus(str, Enum):
     VOID = "void"
 
 class DocumentBase(BaseModel):
-    title: str = Field(..., max_length=200)
+    title: Title200
     document_type: DocumentType
     status: DocumentStatus = DocumentStatus.DRAFT
     reference_number: Optional[str] = None
@@ -31,27 +33,28 @@ class DocumentBase(BaseModel):
     due_date: Optional[datetime] = None
     amount: Optional[float] = None
     currency: str = "USD"
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
     tags: List[str] = []
     is_archived: bool = False
 
 class DocumentCreate(DocumentBase):
     template_id: Optional[str] = None
-    template_data: Optional[Dict[str, Any]] = None
+    template_data: Optional[JSONObject] = None
 
 class DocumentUpdate(BaseModel):
-    title: Optional[str] = Field(None, max_length=200)
+    title: Optional[Title200] = None
     status: Optional[DocumentStatus] = None
     description: Optional[str] = None
     due_date: Optional[datetime] = None
     amount: Optional[float] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
     tags: Optional[List[str]] = None
     is_archived: Optional[bool] = None
 
 class Document(DocumentBase):
-    id: str
-    file_url: Optional[HttpUrl] = None
+    id: int
+    # Read-side: presigned storage URL generated by us, no need to re-parse it
+    file_url: Optional[str] = None
     file_path: Optional[str] = None
     file_name: Optional[str] = None
     file_size: Optional[int] = None
@@ -60,8 +63,7 @@ class Document(DocumentBase):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
 
 class DocumentList(BaseModel):
     items: List[Document]
@@ -70,25 +72,27 @@ class DocumentList(BaseModel):
     size: int
     pages: int
 
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
+
 class DocumentTemplateBase(BaseModel):
-    name: str = Field(..., max_length=100)
+    name: Name100
     description: Optional[str] = None
     template_type: DocumentType
     content: str
     variables: List[str] = []
     is_active: bool = True
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class DocumentTemplateCreate(DocumentTemplateBase):
     pass
 
 class DocumentTemplateUpdate(BaseModel):
-    name: Optional[str] = Field(None, max_length=100)
+    name: Optional[Name100] = None
     description: Optional[str] = None
     content: Optional[str] = None
     variables: Optional[List[str]] = None
     is_active: Optional[bool] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class DocumentTemplate(DocumentTemplateBase):
     id: str
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
@@ -23,8 +23,7 @@ class OrderItemResponse(BaseModel):
     unit_price: Decimal
     subtotal: Decimal
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
 
 class OrderResponse(BaseModel):
     id: int
@@ -39,9 +38,8 @@ class OrderResponse(BaseModel):
     expires_at: Optional[datetime]
     created_at: datetime
     items: List[OrderItemResponse]
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
 
 class OrderStatusUpdate(BaseModel):
     new_status: OrderStatus
@@ -1,8 +1,10 @@
 from enum import Enum
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import Optional, List
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
+from app.schemas._types import JSONObject, NonNegativeAmount, PositiveQty, TaxRate
+
 class OrderItemType(str, Enum):
     PRODUCT = "product"
     DISCOUNT = "discount"
@@ -22,22 +24,22 @@ class OrderItemBase(BaseModel):
     product_type: str
     name: str
     sku: Optional[str] = None
-    quantity: float = Field(..., gt=0)
-    unit_price: float = Field(..., ge=0)
-    tax_rate: float = Field(0.0, ge=0, le=100)
-    discount_amount: float = Field(0.0, ge=0)
-    metadata: Optional[Dict[str, Any]] = None
+    quantity: PositiveQty
+    unit_price: NonNegativeAmount
+    tax_rate: TaxRate = 0.0
+    discount_amount: NonNegativeAmount = 0.0
+    metadata: Optional[JSONObject] = None
 
 class OrderItemCreate(OrderItemBase):
     order_id: str
 
 class OrderItemUpdate(BaseModel):
-    quantity: Optional[float] = Field(None, gt=0)
-    unit_price: Optional[float] = Field(None, ge=0)
-    tax_rate: Optional[float] = Field(None, ge=0, le=100)
-    discount_amount: Optional[float] = Field(None, ge=0)
+    quantity: Optional[PositiveQty] = None
+    unit_price: Optional[NonNegativeAmount] = None
+    tax_rate: Optional[TaxRate] = None
+    discount_amount: Optional[NonNegativeAmount] = None
     status: Optional[OrderItemStatus] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class OrderItem(OrderItemBase):
     id: str
@@ -47,11 +49,10 @@ class OrderItem(OrderItemBase):
     updated_at: datetime
     
     class Config:
-        orm_mode = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+        from_attributes = True
 
 class OrderItemList(BaseModel):
     items: List[OrderItem]
     total: int
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
@@ -1,8 +1,10 @@
 from enum import Enum
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, HttpUrl, validator
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
+from app.schemas._types import JSONObject, Amount
+
 class PaymentStatus(str, Enum):
     PENDING = "pending"
     AUTHORIZED = "authorized"
@@ -24,7 +26,7 @@ class PaymentMethod(str, Enum):
 
 class PaymentBase(BaseModel):
     order_id: int
-    amount: float = Field(..., gt=0)
+    amount: Amount
     payment_method: str  # Changed from enum to str to match model
     payment_reference: Optional[str] = None
     status: str = "pending"  # Changed from enum to str
@@ -44,36 +46,29 @@ class PaymentUpdate(BaseModel):
     notes: Optional[str] = None
 
 class Payment(PaymentBase):
-    id: str
+    id: int
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
-    
-    class Config:
-        orm_mode = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
 
 class PaymentRefund(BaseModel):
-    amount: float = Field(..., gt=0)
+    amount: Amount
     reason: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class PaymentMethodCreate(BaseModel):
     name: str
     description: Optional[str] = None
     is_active: bool = True
     requires_online_processing: bool = False
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class PaymentMethodUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
     is_active: Optional[bool] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class PaymentMethodSchema(PaymentMethodCreate):
     id: str
@@ -81,7 +76,4 @@ class PaymentMethodSchema(PaymentMethodCreate):
     updated_at: datetime
     
     class Config:
-        orm_mode = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+        from_attributes = True
@@ -1,8 +1,10 @@
 from enum import Enum
 from typing import List, Optional, Union
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, TypeAdapter
 from datetime import datetime
 
+from app.schemas._types import Amount, CurrencyCode
+
 class ProductType(str, Enum):
     PHYSICAL = "physical"
     DIGITAL = "digital"
@@ -11,8 +13,8 @@ class ProductType(str, Enum):
 class ProductBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=1000)
-    price: float = Field(..., gt=0, description="Price in the smallest currency unit (e.g., cents)")
-    currency: str = Field("USD", min_length=3, max_length=3)
+    price: Amount = Field(..., description="Price in the smallest currency unit (e.g., cents)")
+    currency: CurrencyCode = "USD"
     product_type: ProductType
     sku: Optional[str] = Field(None, max_length=50)
     barcode: Optional[str] = Field(None, max_length=50)
@@ -25,8 +27,8 @@ class ProductCreate(ProductBase):
 class ProductUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=1000)
-    price: Optional[float] = Field(None, gt=0)
-    currency: Optional[str] = Field(None, min_length=3, max_length=3)
+    price: Optional[Amount] = None
+    currency: Optional[CurrencyCode] = None
     is_active: Optional[bool] = None
     metadata: Optional[dict] = None
 
@@ -62,10 +64,7 @@ class Product(ProductBase):
     updated_at: datetime
     
     class Config:
-        orm_mode = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+        from_attributes = True
 
 class ProductList(BaseModel):
     items: List[Product]
@@ -73,3 +72,8 @@ class ProductList(BaseModel):
     page: int
     size: int
     pages: int
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
+
+# Built once at import so list endpoints reuse the compiled validator/serializer
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[Product])
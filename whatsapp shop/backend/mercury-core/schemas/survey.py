@@ -1,8 +1,10 @@
 from enum import Enum
 from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
+from app.schemas._types import JSONObject
+
 class QuestionType(str, Enum):
     TEXT = "text"
     MULTIPLE_CHOICE = "multiple_choice"
@@ -36,8 +38,8 @@ class QuestionBase(BaseModel):
     is_required: bool = True
     order: int
     options: Optional[List[QuestionOption]] = None
-    validation: Optional[Dict[str, Any]] = None
-    metadata: Optional[Dict[str, Any]] = None
+    validation: Optional[JSONObject] = None
+    metadata: Optional[JSONObject] = None
 
 class QuestionCreate(QuestionBase):
     pass
@@ -49,8 +51,8 @@ class QuestionUpdate(BaseModel):
     is_required: Optional[bool] = None
     order: Optional[int] = None
     options: Optional[List[QuestionOption]] = None
-    validation: Optional[Dict[str, Any]] = None
-    metadata: Optional[Dict[str, Any]] = None
+    validation: Optional[JSONObject] = None
+    metadata: Optional[JSONObject] = None
 
 class Question(QuestionBase):
     id: str
@@ -70,8 +72,8 @@ class SurveyBase(BaseModel):
     is_anonymous: bool = True
     allow_resubmit: bool = False
     thank_you_message: Optional[str] = "Thank you for your response!"
-    theme: Optional[Dict[str, Any]] = None
-    metadata: Optional[Dict[str, Any]] = None
+    theme: Optional[JSONObject] = None
+    metadata: Optional[JSONObject] = None
 
 class SurveyCreate(SurveyBase):
     questions: List[QuestionCreate]
@@ -85,19 +87,18 @@ class SurveyUpdate(BaseModel):
     is_anonymous: Optional[bool] = None
     allow_resubmit: Optional[bool] = None
     thank_you_message: Optional[str] = None
-    theme: Optional[Dict[str, Any]] = None
-    metadata: Optional[Dict[str, Any]] = None
+    theme: Optional[JSONObject] = None
+    metadata: Optional[JSONObject] = None
 
 class Survey(SurveyBase):
-    id: str
+    id: int
     created_by: str
     created_at: datetime
     updated_at: datetime
     questions: List[Question] = []
     response_count: int = 0
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
 
 class SurveyResponseAnswer(BaseModel):
     question_id: str
@@ -107,7 +108,7 @@ class SurveyResponseBase(BaseModel):
     survey_id: str
     respondent_email: Optional[str] = None
     respondent_name: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class SurveyResponseCreate(SurveyResponseBase):
     answers: List[SurveyResponseAnswer]
@@ -118,10 +119,9 @@ class SurveyResponse(SurveyResponseBase):
     time_spent_seconds: Optional[int] = None
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
-    answers: List[Dict[str, Any]]
+    answers: List[JSONObject]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
 
 class SurveyAnalytics(BaseModel):
     total_responses: int
@@ -136,3 +136,5 @@ class SurveyList(BaseModel):
     page: int
     size: int
     pages: int
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
@@ -1,8 +1,10 @@
 from enum import Enum
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from datetime import datetime
 
+from app.schemas._types import JSONObject, NonNegativeAmount
+
 class TransactionType(str, Enum):
     INVOICE = "invoice"
     PAYMENT = "payment"
@@ -20,12 +22,12 @@ class TransactionStatus(str, Enum):
 
 class TransactionLineItem(BaseModel):
     account_id: str
-    amount: float
+    amount: NonNegativeAmount
     is_debit: bool
     description: Optional[str] = None
     reference_id: Optional[str] = None
     reference_type: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class TransactionBase(BaseModel):
     transaction_type: TransactionType
@@ -35,7 +37,7 @@ class TransactionBase(BaseModel):
     status: TransactionStatus = TransactionStatus.DRAFT
     currency: str = "USD"
     exchange_rate: float = 1.0
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class TransactionCreate(TransactionBase):
     line_items: List[TransactionLineItem]
@@ -44,17 +46,16 @@ class TransactionUpdate(BaseModel):
     reference_number: Optional[str] = None
     memo: Optional[str] = None
     status: Optional[TransactionStatus] = None
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[JSONObject] = None
 
 class Transaction(TransactionBase):
-    id: str
+    id: int
     created_at: datetime
     updated_at: datetime
     total_amount: float
     line_items: List[TransactionLineItem]
-    
-    class Config:
-        from_attributes = True
+
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
 
 class TransactionList(BaseModel):
     items: List[Transaction]
@@ -63,6 +64,10 @@ class TransactionList(BaseModel):
     size: int
     pages: int
 
+    model_config = ConfigDict(from_attributes=True, extra="forbid", frozen=True, defer_build=True)
+
+TRANSACTION_LIST_ADAPTER = TypeAdapter(List[Transaction])
+
 class AccountTransaction(Transaction):
     account_name: str
     account_code: str
@@ -1,16 +1,22 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, case
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from app.models.account import Account, AccountType
-from app.models.transaction import Transaction
+from app.models.transaction import Transaction, TransactionType
 from app.schemas.account import AccountCreate, AccountUpdate, Account as AccountSchema, AccountBalance
 from app.services.accounting import AccountingService
 from app.core.logging import setup_logging
 
 logger = setup_logging()
 
+# Columns that AccountUpdate may write; anything else in the payload is ignored
+ALLOWED_ACCOUNT_UPDATE_FIELDS = frozenset({'code', 'name', 'account_type', 'description', 'is_active'})
+
+# Rows fetched per round-trip when streaming accounts
+ACCOUNT_STREAM_BATCH = 1000
+
 class AccountService:
     @staticmethod
     def get_account(db: Session, account_id: str) -> Optional[Account]:
@@ -40,7 +46,7 @@ class AccountService:
 
         db.add(account)
         db.commit()
-        db.refresh(account)
+        AccountingService.invalidate_caches()
 
         logger.info(f"Created account {account.id}: {account.name}")
         return account
@@ -48,26 +54,29 @@ class AccountService:
     @staticmethod
     def update_account(db: Session, account_id: str, account_data: AccountUpdate) -> Account:
         """Update an account"""
-        account = db.query(Account).filter(Account.id == account_id).first()
-        if not account:
-            raise ValueError(f"Account {account_id} not found")
-
         update_data = account_data.dict(exclude_unset=True)
+        values = {k: update_data[k] for k in ALLOWED_ACCOUNT_UPDATE_FIELDS.intersection(update_data)}
 
         # Check code uniqueness if updating code
-        if 'code' in update_data:
+        if 'code' in values:
             existing = db.query(Account).filter(
-                and_(Account.code == update_data['code'], Account.id != account_id)
+                and_(Account.code == values['code'], Account.id != account_id)
             ).first()
             if existing:
-                raise ValueError(f"Account code {update_data['code']} already exists")
+                raise ValueError(f"Account code {values['code']} already exists")
 
-        for field, value in update_data.items():
-            if hasattr(account, field):
-                setattr(account, field, value)
+        if values:
+            updated = db.query(Account).filter(Account.id == account_id).update(
+                values, synchronize_session="fetch"
+            )
+            if not updated:
+                raise ValueError(f"Account {account_id} not found")
+            db.commit()
+            AccountingService.invalidate_caches()
 
-        db.commit()
-        db.refresh(account)
+        account = db.query(Account).filter(Account.id == account_id).first()
+        if not account:
+            raise ValueError(f"Account {account_id} not found")
 
         logger.info(f"Updated account {account_id}")
         return account
@@ -89,6 +98,7 @@ class AccountService:
 
         db.delete(account)
         db.commit()
+        AccountingService.invalidate_caches()
 
         logger.info(f"Deleted account {account_id}")
         return True
@@ -100,9 +110,10 @@ class AccountService:
         limit: int = 100,
         account_type: Optional[AccountType] = None,
         is_active: Optional[bool] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[int] = None
     ) -> List[Account]:
-        """Get accounts with optional filters"""
+        """Get accounts with optional filters; pass cursor (last seen id) for keyset paging"""
         query = db.query(Account)
 
         if account_type:
@@ -117,6 +128,10 @@ class AccountService:
                 )
             )
 
+        query = query.order_by(Account.id)
+        if cursor is not None:
+            # Seek past the previous page instead of scanning and discarding skip rows
+            return query.filter(Account.id > cursor).limit(limit).all()
         return query.offset(skip).limit(limit).all()
 
     @staticmethod
@@ -146,11 +161,30 @@ class AccountService:
     @staticmethod
     def get_all_account_balances(db: Session) -> List[AccountBalance]:
         """Get balances for all accounts"""
-        accounts = db.query(Account).filter(Account.is_active == True).all()
+        # Plain column rows, streamed: no identity map or instrumentation per account
+        accounts = db.query(
+            Account.id, Account.name, Account.code, Account.account_type
+        ).filter(Account.is_active == True).yield_per(ACCOUNT_STREAM_BATCH)
+
+        # One aggregate round-trip for every account instead of two SUMs each
+        sums = {
+            (account_id, transaction_type): total or 0
+            for account_id, transaction_type, total in db.query(
+                Transaction.account_id,
+                Transaction.transaction_type,
+                func.sum(Transaction.amount)
+            ).group_by(Transaction.account_id, Transaction.transaction_type).all()
+        }
+
         balances = []
+        updates = []
 
         for account in accounts:
-            balance = AccountService.get_account_balance(db, account.id)
+            balance = (
+                sums.get((account.id, TransactionType.DEBIT), 0)
+                - sums.get((account.id, TransactionType.CREDIT), 0)
+            )
+            updates.append({"id": account.id, "balance": balance})
             balances.append(AccountBalance(
                 account_id=account.id,
                 account_name=account.name,
@@ -159,18 +193,57 @@ class AccountService:
                 account_type=account.account_type
             ))
 
+        # Update denormalized balances in a single batch
+        if updates:
+            db.bulk_update_mappings(Account, updates)
+            db.commit()
+            # Loaded Account objects still hold the old balances
+            db.expire_all()
+
         return balances
 
     @staticmethod
     def get_trial_balance(db: Session) -> Dict[str, Any]:
         """Generate trial balance"""
-        balances = AccountService.get_all_account_balances(db)
-
-        total_debit = sum(b.balance for b in balances if b.balance > 0)
-        total_credit = abs(sum(b.balance for b in balances if b.balance < 0))
+        # Single read-only aggregate: debits minus credits per active account
+        signed_amount = case(
+            (Transaction.transaction_type == TransactionType.DEBIT, Transaction.amount),
+            else_=-Transaction.amount
+        )
+        rows = db.query(
+            Account.id,
+            Account.name,
+            Account.code,
+            Account.account_type,
+            func.coalesce(func.sum(signed_amount), 0).label('balance')
+        ).outerjoin(
+            Transaction, Transaction.account_id == Account.id
+        ).filter(
+            Account.is_active == True
+        ).group_by(
+            Account.id, Account.name, Account.code, Account.account_type
+        ).all()
+
+        # Build the rows and both totals in a single pass
+        balances = []
+        total_debit = 0
+        total_credit = 0
+        for row in rows:
+            balance = row.balance
+            if balance > 0:
+                total_debit += balance
+            elif balance < 0:
+                total_credit -= balance
+            balances.append({
+                'account_id': row.id,
+                'account_name': row.name,
+                'account_code': row.code,
+                'balance': balance,
+                'account_type': row.account_type
+            })
 
         return {
-            'accounts': [b.dict() for b in balances],
+            'accounts': balances,
             'total_debit': total_debit,
             'total_credit': total_credit,
             'balanced': abs(total_debit - total_credit) < 0.01  # Allow for small rounding differences
@@ -1,21 +1,84 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, case, lambda_stmt, select
 from datetime import datetime
+from decimal import Decimal
 from typing import Optional, List
-import uuid
+import time
 
 from app.models.account import Account, AccountType
 from app.models.transaction import Transaction, TransactionType
+from app.schemas._internal import TransactionLineItemDC
 from app.core.logging import setup_logging
+from app.utils.ids import generate_reference
 
 logger = setup_logging()
 
+# +1 for debit-normal accounts (a debit increases the balance), -1 for
+# credit-normal ones
+_DEBIT_SIGN = {
+    AccountType.ASSET: 1,
+    AccountType.EXPENSE: 1,
+    AccountType.LIABILITY: -1,
+    AccountType.EQUITY: -1,
+    AccountType.INCOME: -1,
+}
+_DEBIT_NORMAL_TYPES = frozenset(t for t, sign in _DEBIT_SIGN.items() if sign > 0)
+
+# Process-local cache for the revenue account id: {"revenue": (id, expires_at)}
+_REVENUE_ACCOUNT_TTL = 300  # seconds
+_account_id_cache = {}
+
+# Process-local cache of (id, name, code) per account type: {AccountType: (rows, expires_at)}
+_ACCOUNT_LIST_TTL = 60  # seconds
+_account_list_cache = {}
+
 class AccountingService:
     
+    @staticmethod
+    def invalidate_caches():
+        """Drop cached account lookups after the chart of accounts changes"""
+        _account_id_cache.clear()
+        _account_list_cache.clear()
+    
+    @staticmethod
+    def _get_revenue_account_id(db: Session) -> Optional[int]:
+        """Get the revenue account id, cached for a few minutes"""
+        now = time.monotonic()
+        cached = _account_id_cache.get("revenue")
+        if cached and cached[1] > now:
+            return cached[0]
+        
+        account_id = db.query(Account.id).filter(
+            Account.account_type == AccountType.INCOME,
+            Account.code.like("4%")
+        ).limit(1).scalar()
+        
+        if account_id is not None:
+            _account_id_cache["revenue"] = (account_id, now + _REVENUE_ACCOUNT_TTL)
+        return account_id
+    
+    @staticmethod
+    def get_accounts_by_type(db: Session, account_type: AccountType) -> tuple:
+        """(id, name, code) of every account of a type, cached for a minute"""
+        now = time.monotonic()
+        cached = _account_list_cache.get(account_type)
+        if cached and cached[1] > now:
+            return cached[0]
+        
+        # Plain tuples, not ORM objects, so cached rows are safe to share between sessions
+        rows = tuple(
+            (account_id, name, code)
+            for account_id, name, code in db.query(Account.id, Account.name, Account.code).filter(
+                Account.account_type == account_type
+            ).order_by(Account.code)
+        )
+        _account_list_cache[account_type] = (rows, now + _ACCOUNT_LIST_TTL)
+        return rows
+    
     @staticmethod
     def create_journal_entry(
         db: Session,
-        entries: List[dict],
+        entries: List[TransactionLineItemDC],
         description: str,
         reference: Optional[str] = None,
         performed_by: Optional[str] = None,
@@ -24,49 +87,66 @@ class AccountingService:
     ) -> str:
         """Create double-entry journal entry"""
         
-        journal_entry_id = f"JE-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+        journal_entry_id = generate_reference("JE")
         
         total_debit = 0
         total_credit = 0
         
+        rows = []
+        # Net debit (debits minus credits) per account; the account-type sign
+        # is applied in SQL so no lookup query is needed before writing
+        net_debit_by_account = {}
         for entry in entries:
-            account = db.query(Account).filter(Account.id == entry["account_id"]).first()
-            if not account:
-                raise ValueError(f"Account {entry['account_id']} not found")
-            
-            transaction = Transaction(
-                journal_entry_id=journal_entry_id,
-                account_id=entry["account_id"],
-                transaction_type=entry["type"],
-                amount=entry["amount"],
-                description=description,
-                reference=reference,
-                performed_by=performed_by,
-                source_type=source_type,
-                source_id=source_id
-            )
+            rows.append({
+                "journal_entry_id": journal_entry_id,
+                "account_id": entry.account_id,
+                "transaction_type": TransactionType.DEBIT if entry.is_debit else TransactionType.CREDIT,
+                "amount": entry.amount,
+                "description": description,
+                "reference": reference,
+                "performed_by": performed_by,
+                "source_type": source_type,
+                "source_id": source_id
+            })
             
-            db.add(transaction)
-            
-            # Update account balance
-            if entry["type"] == TransactionType.DEBIT:
-                total_debit += entry["amount"]
-                if account.account_type in [AccountType.ASSET, AccountType.EXPENSE]:
-                    account.balance += entry["amount"]
-                else:
-                    account.balance -= entry["amount"]
+            # Accumulate balance change per account
+            if entry.is_debit:
+                total_debit += entry.amount
+                net_debit = entry.amount
             else:  # CREDIT
-                total_credit += entry["amount"]
-                if account.account_type in [AccountType.LIABILITY, AccountType.EQUITY, AccountType.INCOME]:
-                    account.balance += entry["amount"]
-                else:
-                    account.balance -= entry["amount"]
+                total_credit += entry.amount
+                net_debit = -entry.amount
+            net_debit_by_account[entry.account_id] = net_debit_by_account.get(entry.account_id, 0) + net_debit
         
         # Verify double-entry
         if abs(total_debit - total_credit) > 0.01:
             raise ValueError(f"Unbalanced entry: Debit {total_debit} != Credit {total_credit}")
         
+        # One UPDATE for every account in the entry: balance moves by the net
+        # debit for debit-normal accounts and by its negation otherwise. It is
+        # incremented in SQL so concurrent journal entries don't overwrite each other
+        accounts = Account.__table__
+        sign = case((accounts.c.account_type.in_(tuple(_DEBIT_NORMAL_TYPES)), 1), else_=-1)
+        # Amounts may arrive as floats; bind them as exact Decimals for the Numeric balance
+        net_debit = case(
+            {aid: Decimal(str(amount)) for aid, amount in net_debit_by_account.items()},
+            value=accounts.c.id
+        )
+        result = db.execute(
+            accounts.update()
+            .where(accounts.c.id.in_(tuple(net_debit_by_account)))
+            .values(balance=accounts.c.balance + sign * net_debit)
+        )
+        if result.rowcount != len(net_debit_by_account):
+            db.rollback()
+            found = {aid for (aid,) in db.query(Account.id).filter(Account.id.in_(tuple(net_debit_by_account)))}
+            missing = sorted(set(net_debit_by_account) - found)
+            raise ValueError(f"Account {missing[0]} not found")
+        
+        db.bulk_insert_mappings(Transaction, rows)
         db.commit()
+        # Balances moved in SQL; don't let loaded Account objects serve stale values
+        db.expire_all()
         
         logger.info(f"Journal entry created: {journal_entry_id}")
         return journal_entry_id
@@ -82,17 +162,14 @@ class AccountingService:
         """Record a sale"""
         
         # Get revenue account
-        revenue_account = db.query(Account).filter(
-            Account.account_type == AccountType.INCOME,
-            Account.code.like("4%")
-        ).first()
+        revenue_account_id = AccountingService._get_revenue_account_id(db)
         
-        if not revenue_account:
+        if revenue_account_id is None:
             raise ValueError("Revenue account not found")
         
         entries = [
-            {"account_id": account_id, "type": TransactionType.DEBIT, "amount": amount},
-            {"account_id": revenue_account.id, "type": TransactionType.CREDIT, "amount": amount}
+            TransactionLineItemDC(account_id=account_id, amount=amount, is_debit=True),
+            TransactionLineItemDC(account_id=revenue_account_id, amount=amount, is_debit=False)
         ]
         
         return AccountingService.create_journal_entry(
@@ -112,8 +189,8 @@ class AccountingService:
         """Record an expense"""
         
         entries = [
-            {"account_id": expense_account_id, "type": TransactionType.DEBIT, "amount": amount},
-            {"account_id": payment_account_id, "type": TransactionType.CREDIT, "amount": amount}
+            TransactionLineItemDC(account_id=expense_account_id, amount=amount, is_debit=True),
+            TransactionLineItemDC(account_id=payment_account_id, amount=amount, is_debit=False)
         ]
         
         return AccountingService.create_journal_entry(
@@ -135,8 +212,8 @@ class AccountingService:
         description = notes or f"Transfer {amount}"
         
         entries = [
-            {"account_id": to_account_id, "type": TransactionType.DEBIT, "amount": amount},
-            {"account_id": from_account_id, "type": TransactionType.CREDIT, "amount": amount}
+            TransactionLineItemDC(account_id=to_account_id, amount=amount, is_debit=True),
+            TransactionLineItemDC(account_id=from_account_id, amount=amount, is_debit=False)
         ]
         
         return AccountingService.create_journal_entry(
@@ -145,46 +222,47 @@ class AccountingService:
         )
     
     @staticmethod
-    def get_account_balance(db: Session, account_id: int) -> float:
+    def get_account_balance(db: Session, account_id: int) -> Decimal:
         """Get current account balance"""
-        account = db.query(Account).filter(Account.id == account_id).first()
+        account = db.get(Account, account_id)
         if not account:
             raise ValueError("Account not found")
-        return float(account.balance)
+        return account.balance
     
     @staticmethod
     def get_trial_balance(db: Session, as_of_date: Optional[datetime] = None):
         """Generate trial balance"""
-        query = db.query(Account).filter(Account.is_active == True)
-        accounts = query.all()
+        filters = (Account.is_active == True, Account.balance > 0)
+        
+        # Plain row tuples; no need to hydrate full Account objects
+        rows = db.execute(lambda_stmt(
+            lambda: select(Account.name, Account.code, Account.account_type, Account.balance).where(*filters)
+        )).all()
         
         trial_balance = []
-        total_debit = 0
-        total_credit = 0
+        for name, code, account_type, balance in rows:
+            is_debit = account_type in _DEBIT_NORMAL_TYPES
+            trial_balance.append({
+                "account": name,
+                "code": code,
+                "debit": balance if is_debit else 0,
+                "credit": 0 if is_debit else balance
+            })
         
-        for account in accounts:
-            balance = float(account.balance)
-            if balance > 0:
-                if account.account_type in [AccountType.ASSET, AccountType.EXPENSE]:
-                    trial_balance.append({
-                        "account": account.name,
-                        "code": account.code,
-                        "debit": balance,
-                        "credit": 0
-                    })
-                    total_debit += balance
-                else:
-                    trial_balance.append({
-                        "account": account.name,
-                        "code": account.code,
-                        "debit": 0,
-                        "credit": balance
-                    })
-                    total_credit += balance
+        # Totals come straight from the database
+        is_debit_normal = Account.account_type.in_(tuple(_DEBIT_NORMAL_TYPES))
+        totals = db.query(
+            func.coalesce(func.sum(case((is_debit_normal, Account.balance), else_=0)), 0).label("debit"),
+            func.coalesce(func.sum(case((~is_debit_normal, Account.balance), else_=0)), 0).label("credit")
+        ).filter(*filters).one()
+        # Both sums are typed by the Numeric(15, 2) balance column, so they come back
+        # as exact Decimals and can be compared directly
+        total_debit = totals.debit
+        total_credit = totals.credit
         
         return {
             "accounts": trial_balance,
             "total_debit": total_debit,
             "total_credit": total_credit,
-            "balanced": abs(total_debit - total_credit) < 0.01
+            "balanced": total_debit == total_credit
         }
\ No newline at end of file
@@ -1,22 +1,38 @@
+import asyncio
+import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import Session, raiseload
 from fastapi import HTTPException, status
 from app.models.booking import Booking, BookingStatus
 from app.models.product import Product
-from app.core.logging import setup_logging
+from app.utils.ids import generate_reference
 from app.services.calendar import CalendarService, CalendarEvent
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
+
+# Strong references to in-flight calendar cleanups so they aren't garbage-collected
+_background_tasks = set()
+
+
+async def _cancel_calendar_event(event_id: str) -> None:
+    try:
+        await CalendarService().cancel_event(event_id)
+    except Exception:
+        logger.warning(f"Failed to cancel calendar event {event_id}")
+
 
 class BookingService:
     @staticmethod
     def get_booking(db: Session, booking_id: int) -> Optional[Booking]:
-        return db.query(Booking).filter(Booking.id == booking_id).first()
+        return db.get(Booking, booking_id)
 
     @staticmethod
     def list_bookings(db: Session, skip: int = 0, limit: int = 50) -> List[Booking]:
-        return db.query(Booking).offset(skip).limit(limit).all()
+        # Cached statement; skip/limit are bound per call. raiseload flags any lazy load (N+1)
+        stmt = lambda_stmt(lambda: select(Booking).options(raiseload("*")).offset(skip).limit(limit))
+        return db.execute(stmt).scalars().all()
 
     @staticmethod
     def create_booking(db: Session, data: Dict[str, Any]) -> Booking:
@@ -24,12 +40,12 @@ class BookingService:
         service_id = data.get("service_id") or data.get("product_id")
         if not service_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Product/service id is required")
-        product = db.query(Product).filter(Product.id == service_id).first()
+        product = db.get(Product, service_id)
         if not product:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Product/service not found")
 
         booking = Booking(
-            booking_number=f"BK-{int(datetime.utcnow().timestamp())}",
+            booking_number=generate_reference("BK"),
             customer_id=data.get("customer_id"),
             product_id=product.id,
             scheduled_start=data.get("start_time"),
@@ -43,8 +59,6 @@ class BookingService:
 
         db.add(booking)
         db.commit()
-        db.refresh(booking)
-
         logger.info(f"Created booking {booking.booking_number} for product {product.id}")
         return booking
 
@@ -70,23 +84,21 @@ class BookingService:
         booking.confirmed_by = user_id
 
         db.commit()
-        db.refresh(booking)
         logger.info(f"Confirmed booking {booking.booking_number} with calendar id {booking.calendar_event_id}")
         return booking
 
     @staticmethod
     async def cancel_booking(db: Session, booking: Booking) -> Booking:
-        # Cancel calendar event if present
-        if booking.calendar_event_id:
-            cal = CalendarService()
-            try:
-                await cal.cancel_event(booking.calendar_event_id)
-            except Exception:
-                logger.warning(f"Failed to cancel calendar event {booking.calendar_event_id}")
+        event_id = booking.calendar_event_id
 
         booking.status = BookingStatus.CANCELLED
         db.commit()
-        db.refresh(booking)
-
         logger.info(f"Cancelled booking {booking.booking_number}")
+
+        # The booking is cancelled whether or not the calendar delete succeeds,
+        # so don't hold the response for the webhook round-trip
+        if event_id:
+            task = asyncio.create_task(_cancel_calendar_event(event_id))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
         return booking
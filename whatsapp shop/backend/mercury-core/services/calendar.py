@@ -2,8 +2,10 @@ from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, timedelta
 import httpx
 import os
+from time import time_ns
 from fastapi import HTTPException, status
 from pydantic import BaseModel
+from pydantic_core import from_json, to_json
 from ..core.config import settings
 
 class CalendarEvent(BaseModel):
@@ -20,11 +22,32 @@ class CalendarEvent(BaseModel):
 class CalendarService:
     """Service for managing calendar events via n8n webhooks"""
     
+    # Shared client opened by the app lifespan so webhook calls reuse pooled
+    # keep-alive connections; outside the app we fall back to a per-call client
+    _client: Optional[httpx.AsyncClient] = None
+    timeout = 30  # seconds
+    
+    @classmethod
+    def open_client(cls) -> httpx.AsyncClient:
+        """Create the shared n8n HTTP client"""
+        if cls._client is None:
+            cls._client = httpx.AsyncClient(
+                timeout=cls.timeout,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+            )
+        return cls._client
+    
+    @classmethod
+    async def close_client(cls) -> None:
+        """Close the shared n8n HTTP client"""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+    
     def __init__(self):
         # Use getattr to avoid raising during import if settings are missing
         self.n8n_webhook_url = getattr(settings, "N8N_WEBHOOK_URL", None)
         self.api_key = getattr(settings, "N8N_API_KEY", None)
-        self.timeout = 30  # seconds
         self.dry_run = not (self.n8n_webhook_url and self.api_key)
         if self.dry_run:
             # local/dev environment - don't fail import if n8n is not configured
@@ -43,7 +66,7 @@ class CalendarService:
         if self.dry_run:
             # Simulate plausible responses for common actions
             if action == "create_event":
-                return {"success": True, "id": f"dry-{int(datetime.utcnow().timestamp())}"}
+                return {"success": True, "id": f"dry-{time_ns() // 1_000_000_000}"}
             if action in ("delete_event", "update_event"):
                 return {"success": True}
             if action == "get_available_slots":
@@ -55,30 +78,39 @@ class CalendarService:
             "X-N8N-API-KEY": self.api_key
         }
         
-        data = {
+        # Encoded once with pydantic-core's native serializer rather than stdlib json
+        body = to_json({
             "action": action,
             "payload": payload
-        }
+        })
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
+        try:
+            if CalendarService._client is not None:
+                response = await CalendarService._client.post(
                     self.n8n_webhook_url,
-                    json=data,
-                    headers=headers
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail=f"n8n API error: {str(e)}"
-                )
-            except Exception as e:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to call n8n webhook: {str(e)}"
+                    content=body,
+                    headers=headers,
+                    timeout=self.timeout
                 )
+            else:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.post(
+                        self.n8n_webhook_url,
+                        content=body,
+                        headers=headers
+                    )
+            response.raise_for_status()
+            return from_json(response.content)
+        except httpx.HTTPStatusError as e:
+            raise HTTPException(
+                status_code=e.response.status_code,
+                detail=f"n8n API error: {str(e)}"
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to call n8n webhook: {str(e)}"
+            )
 
     async def create_event(self, event: CalendarEvent) -> Dict[str, Any]:
         """Create a new calendar event via n8n"""
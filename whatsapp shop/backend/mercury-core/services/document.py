@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Session
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
 from pypdf import PdfReader, PdfWriter
-import uuid
 import io
+import logging
 from datetime import datetime
 from typing import Optional
 from pathlib import Path
@@ -11,15 +12,23 @@ from pathlib import Path
 from app.models.document import Document, DocumentType
 from app.documents.storage import MinIOStorage
 from app.core.config import settings
-from app.core.logging import setup_logging
+from app.utils.ids import generate_reference
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
 
 class DocumentService:
     
     def __init__(self):
         template_dir = Path(__file__).parent.parent / "templates" / "html"
-        self.jinja_env = Environment(loader=FileSystemLoader(str(template_dir)))
+        # Templates ship with the image, so skip the per-render mtime check; compiled
+        # bytecode is cached on disk so new workers don't re-parse every template
+        self.jinja_env = Environment(
+            loader=FileSystemLoader(str(template_dir)),
+            auto_reload=False,
+            bytecode_cache=FileSystemBytecodeCache()
+        )
+        # Font discovery dominates WeasyPrint render time; do it once per service
+        self.font_config = FontConfiguration()
         self.storage = MinIOStorage()
     
     def generate_pdf(
@@ -27,40 +36,39 @@ class DocumentService:
         template_name: str,
         context: dict,
         password: Optional[str] = None
-    ) -> bytes:
+    ) -> io.BytesIO:
         """Generate PDF from HTML template"""
         
         # Render HTML
         template = self.jinja_env.get_template(template_name)
         html_content = template.render(**context)
         
-        # Convert to PDF
-        pdf_bytes = HTML(string=html_content).write_pdf()
+        # Convert to PDF, writing straight into a buffer we can hand to storage
+        pdf_stream = io.BytesIO()
+        HTML(string=html_content).write_pdf(pdf_stream, font_config=self.font_config)
+        pdf_stream.seek(0)
         
         # Apply password protection if needed
         if password or settings.PDF_PASSWORD_PROTECTION:
             pdf_password = password or settings.PDF_DEFAULT_PASSWORD
             if pdf_password:
-                pdf_bytes = self._protect_pdf(pdf_bytes, pdf_password)
+                pdf_stream = self._protect_pdf(pdf_stream, pdf_password)
         
-        return pdf_bytes
+        return pdf_stream
     
-    def _protect_pdf(self, pdf_bytes: bytes, password: str) -> bytes:
+    def _protect_pdf(self, pdf_stream: io.BytesIO, password: str) -> io.BytesIO:
         """Apply password protection to PDF"""
         
-        reader = PdfReader(io.BytesIO(pdf_bytes))
-        writer = PdfWriter()
-        
-        for page in reader.pages:
-            writer.add_page(page)
-        
+        # Clone the whole document in one step instead of copying page by page;
+        # AES runs through the cryptography (OpenSSL) backend from pypdf[crypto]
+        writer = PdfWriter(clone_from=PdfReader(pdf_stream))
         writer.encrypt(user_password=password, owner_password=password, algorithm="AES-256")
         
         output = io.BytesIO()
         writer.write(output)
         output.seek(0)
         
-        return output.read()
+        return output
     
     def create_invoice(
         self,
@@ -84,16 +92,16 @@ class DocumentService:
             "invoice_number": f"INV-{order.order_number}"
         }
         
-        pdf_bytes = self.generate_pdf("invoice.html", context, password)
+        pdf_stream = self.generate_pdf("invoice.html", context, password)
         
         # Store in MinIO
-        doc_number = f"INV-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+        doc_number = generate_reference("INV")
         file_path = f"invoices/{doc_number}.pdf"
         
         file_url = self.storage.upload(
             bucket=settings.MINIO_BUCKET_DOCUMENTS,
             object_name=file_path,
-            data=pdf_bytes,
+            data=pdf_stream,
             content_type="application/pdf"
         )
         
@@ -110,7 +118,6 @@ class DocumentService:
         
         db.add(document)
         db.commit()
-        db.refresh(document)
         
         logger.info(f"Invoice generated: {doc_number}")
         return document
@@ -137,15 +144,15 @@ class DocumentService:
             "receipt_number": f"RCP-{payment.payment_reference}"
         }
         
-        pdf_bytes = self.generate_pdf("receipt.html", context, password)
+        pdf_stream = self.generate_pdf("receipt.html", context, password)
         
-        doc_number = f"RCP-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+        doc_number = generate_reference("RCP")
         file_path = f"receipts/{doc_number}.pdf"
         
         file_url = self.storage.upload(
             bucket=settings.MINIO_BUCKET_DOCUMENTS,
             object_name=file_path,
-            data=pdf_bytes,
+            data=pdf_stream,
             content_type="application/pdf"
         )
         
@@ -161,7 +168,6 @@ class DocumentService:
         
         db.add(document)
         db.commit()
-        db.refresh(document)
         
         logger.info(f"Receipt generated: {doc_number}")
         return document
\ No newline at end of file
@@ -1,12 +1,26 @@
+import logging
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 from app.models.inventory import InventoryMovement, MovementType
 from app.models.product import Product, ProductType
-from app.core.logging import setup_logging
+from app.utils.pagination import Cursor, keyset_page
 
-logger = setup_logging()
+logger = logging.getLogger(__name__)
+
+# Direction each movement type moves stock; adjustments carry their own sign
+_STOCK_SIGN = {
+    MovementType.INBOUND: 1,
+    MovementType.RETURN: 1,
+    MovementType.ADJUSTMENT: 1,
+    MovementType.OUTBOUND: -1,
+    MovementType.DAMAGE: -1,
+}
 
 class InventoryService:
     
@@ -23,12 +37,36 @@ class InventoryService:
     ) -> InventoryMovement:
         """Record inventory movement"""
         
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product:
-            raise ValueError("Product not found")
+        delta = _STOCK_SIGN[MovementType(movement_type)] * quantity
+        
+        # Check and apply the stock change in one atomic UPDATE; the guard in the
+        # WHERE clause means concurrent movements can never take stock below zero
+        new_stock = func.coalesce(Product.stock_quantity, 0) + delta
+        row = db.execute(
+            update(Product)
+            .where(
+                Product.id == product_id,
+                Product.product_type == ProductType.PHYSICAL,
+                new_stock >= 0
+            )
+            .values(stock_quantity=new_stock)
+            .returning(Product.name, Product.stock_quantity),
+            execution_options={"synchronize_session": False}
+        ).first()
+        
+        if row is None:
+            # Nothing matched; work out why (only on the failure path)
+            product = db.get(Product, product_id)
+            if not product:
+                raise ValueError("Product not found")
+            if product.product_type != ProductType.PHYSICAL:
+                raise ValueError("Only physical products have inventory")
+            raise ValueError("Insufficient stock")
         
-        if product.product_type != ProductType.PHYSICAL:
-            raise ValueError("Only physical products have inventory")
+        # Stock moved in SQL; give a loaded Product the returned value so it isn't stale
+        product = db.identity_map.get(identity_key(Product, product_id))
+        if product is not None:
+            set_committed_value(product, "stock_quantity", row.stock_quantity)
         
         # Create movement record
         movement = InventoryMovement(
@@ -42,24 +80,82 @@ class InventoryService:
         )
         
         db.add(movement)
-        
-        # Update stock quantity
-        if movement_type in [MovementType.PURCHASE, MovementType.RETURN]:
-            product.stock_quantity += quantity
-        elif movement_type in [MovementType.SALE, MovementType.DAMAGE]:
-            if product.stock_quantity < quantity:
-                raise ValueError("Insufficient stock")
-            product.stock_quantity -= quantity
-        elif movement_type == MovementType.ADJUSTMENT:
-            # Adjustment can be positive or negative
-            product.stock_quantity += quantity
-        
         db.commit()
-        db.refresh(movement)
         
-        logger.info(f"Inventory movement recorded: {product.name} - {movement_type} - {quantity}")
+        logger.info(f"Inventory movement recorded: {row.name} - {movement_type} - {quantity}")
         return movement
     
+    @staticmethod
+    def record_movements_bulk(
+        db: Session,
+        movements: List[Dict[str, Any]],
+        performed_by: str
+    ) -> int:
+        """Record many inventory movements in one batch"""
+        
+        # One query for every product touched by the batch; NULL stock counts as 0
+        product_ids = {m["product_id"] for m in movements}
+        products = {
+            pid: (product_type, stock)
+            for pid, product_type, stock in db.query(
+                Product.id, Product.product_type, func.coalesce(Product.stock_quantity, 0)
+            ).filter(Product.id.in_(product_ids)).with_for_update().all()
+        }
+        
+        rows = []
+        delta_by_product = {}
+        for m in movements:
+            product_id = m["product_id"]
+            # Roll back on every rejection so the row locks taken above are released
+            if product_id not in products:
+                db.rollback()
+                raise ValueError(f"Product not found: {product_id}")
+            if products[product_id][0] != ProductType.PHYSICAL:
+                db.rollback()
+                raise ValueError("Only physical products have inventory")
+            
+            movement_type = MovementType(m["movement_type"])
+            delta = _STOCK_SIGN[movement_type] * m["quantity"]
+            delta_by_product[product_id] = delta_by_product.get(product_id, 0) + delta
+            rows.append({
+                "product_id": product_id,
+                "movement_type": movement_type,
+                "quantity": m["quantity"],
+                "reference": m.get("reference"),
+                "notes": m.get("notes"),
+                "unit_cost": m.get("unit_cost"),
+                "performed_by": performed_by
+            })
+        
+        for product_id, delta in delta_by_product.items():
+            if products[product_id][1] + delta < 0:
+                db.rollback()
+                raise ValueError(f"Insufficient stock for product {product_id}")
+        
+        db.bulk_insert_mappings(InventoryMovement, rows)
+        
+        # Single executemany UPDATE; stock is adjusted in SQL so concurrent
+        # movements don't overwrite each other
+        product_table = Product.__table__
+        try:
+            db.execute(
+                product_table.update()
+                .where(product_table.c.id == bindparam("pid"))
+                .values(stock_quantity=func.coalesce(product_table.c.stock_quantity, 0) + bindparam("delta")),
+                [{"pid": pid, "delta": delta} for pid, delta in delta_by_product.items()]
+            )
+            db.commit()
+        except IntegrityError:
+            # ck_product_stock_nonneg caught a writer that got past the check above
+            db.rollback()
+            raise ValueError("Insufficient stock")
+        
+        # Stock moved in SQL; don't let loaded Product objects serve stale values
+        db.expire_all()
+        
+        logger.info(f"Inventory movements recorded: {len(rows)} across {len(delta_by_product)} products")
+        return len(rows)
+    
     @staticmethod
     def record_purchase(
         db: Session,
@@ -71,7 +167,7 @@ class InventoryService:
     ) -> InventoryMovement:
         """Record purchase (increases stock)"""
         return InventoryService.record_movement(
-            db, product_id, MovementType.PURCHASE, quantity,
+            db, product_id, MovementType.INBOUND, quantity,
             performed_by, reference, unit_cost=unit_cost
         )
     
@@ -85,7 +181,7 @@ class InventoryService:
     ) -> InventoryMovement:
         """Record sale (decreases stock)"""
         return InventoryService.record_movement(
-            db, product_id, MovementType.SALE, quantity,
+            db, product_id, MovementType.OUTBOUND, quantity,
             performed_by, reference
         )
     
@@ -107,18 +203,17 @@ class InventoryService:
     def get_product_movements(
         db: Session,
         product_id: int,
-        skip: int = 0,
+        cursor: Optional[Cursor] = None,
         limit: int = 100
     ):
-        """Get movement history for product"""
-        return db.query(InventoryMovement).filter(
-            InventoryMovement.product_id == product_id
-        ).order_by(InventoryMovement.created_at.desc()).offset(skip).limit(limit).all()
+        """Get movement history for product, newest first, after cursor"""
+        query = db.query(InventoryMovement).filter(InventoryMovement.product_id == product_id)
+        return keyset_page(query, InventoryMovement, cursor, limit).all()
     
     @staticmethod
     def get_current_stock(db: Session, product_id: int) -> int:
         """Get current stock level"""
-        product = db.query(Product).filter(Product.id == product_id).first()
+        product = db.get(Product, product_id)
         if not product:
             raise ValueError("Product not found")
         return product.stock_quantity
\ No newline at end of file
@@ -1,7 +1,9 @@
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 from datetime import datetime, timedelta
 from typing import Optional
-import uuid
 
 from app.models.order import Order, OrderStatus, OrderSource
 from app.models.order_item import OrderItem
@@ -9,10 +11,20 @@ from app.models.state_transition import OrderStateTransition
 from app.models.product import Product
 from app.fsm.order_states import can_transition
 from app.core.config import settings
+from app.db.bulk import bulk_insert
 from app.core.logging import setup_logging
+from app.utils.ids import generate_sequential_reference
+from app.utils.pagination import Cursor, keyset_page
 
 logger = setup_logging()
 
+# Orders expired per transaction by the periodic sweep
+EXPIRE_BATCH_SIZE = 10_000
+
+
+class OrderConflictError(ValueError):
+    """The order was changed by someone else in the meantime; reload and retry"""
+
 class OrderService:
     
     @staticmethod
@@ -26,31 +38,30 @@ class OrderService:
         """Create new order"""
         
         # Generate order number
-        order_number = f"ORD-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+        order_number = generate_sequential_reference("ORD")
         
-        # Calculate totals
-        subtotal = 0
         order_items = []
         
+        # One query for every product in the cart
+        product_ids = {item["product_id"] for item in items}
+        products = {p.id: p for p in db.query(Product).filter(Product.id.in_(product_ids)).all()}
+        
         for item in items:
-            product = db.query(Product).filter(Product.id == item["product_id"]).first()
+            product = products.get(item["product_id"])
             if not product:
                 raise ValueError(f"Product {item['product_id']} not found")
             
             quantity = item["quantity"]
             unit_price = product.selling_price
-            item_subtotal = unit_price * quantity
-            subtotal += item_subtotal
             
-            order_item = OrderItem(
-                product_id=product.id,
-                product_name=product.name,
-                product_sku=product.sku,
-                quantity=quantity,
-                unit_price=unit_price,
-                subtotal=item_subtotal
-            )
-            order_items.append(order_item)
+            order_items.append({
+                "product_id": product.id,
+                "product_name": product.name,
+                "product_sku": product.sku,
+                "quantity": quantity,
+                "unit_price": unit_price,
+                "subtotal": unit_price * quantity
+            })
         
         # Create order
         expires_at = datetime.utcnow() + timedelta(hours=settings.ORDER_EXPIRY_HOURS)
@@ -60,8 +71,8 @@ class OrderService:
             customer_id=customer_id,
             status=OrderStatus.PENDING_PAYMENT,
             source=source,
-            subtotal=subtotal,
-            total_amount=subtotal,
+            subtotal=0,
+            total_amount=0,
             delivery_address=delivery_address,
             expires_at=expires_at
         )
@@ -69,12 +80,32 @@ class OrderService:
         db.add(order)
         db.flush()
         
+        # All line items in one multi-row INSERT (COPY for large orders)
         for order_item in order_items:
-            order_item.order_id = order.id
-            db.add(order_item)
+            order_item["order_id"] = order.id
+        bulk_insert(db, OrderItem, order_items)
+        
+        # Totals are summed from the stored line items by the database
+        items_total = (
+            select(func.coalesce(func.sum(OrderItem.subtotal), 0))
+            .where(OrderItem.order_id == order.id)
+            .scalar_subquery()
+        )
+        totals = db.execute(
+            update(Order)
+            .where(Order.id == order.id)
+            .values(
+                subtotal=items_total,
+                total_amount=items_total + Order.tax_amount - Order.discount_amount
+            )
+            .returning(Order.subtotal, Order.total_amount),
+            execution_options={"synchronize_session": False}
+        ).one()
         
         db.commit()
-        db.refresh(order)
+        # Hydrate from RETURNING so reading the totals doesn't cost another SELECT
+        set_committed_value(order, "subtotal", totals.subtotal)
+        set_committed_value(order, "total_amount", totals.total_amount)
         
         logger.info(f"Order created: {order_number}")
         return order
@@ -118,8 +149,11 @@ class OrderService:
         elif new_state == OrderStatus.COMPLETED:
             order.completed_at = datetime.utcnow()
         
-        db.commit()
-        db.refresh(order)
+        try:
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            raise OrderConflictError(f"Order {order_id} was modified concurrently")
         
         logger.info(f"Order {order.order_number} transitioned: {old_state} -> {new_state}")
         return order
@@ -130,24 +164,58 @@ class OrderService:
         return db.query(Order).filter(Order.order_number == order_number).first()
     
     @staticmethod
-    def get_customer_orders(db: Session, customer_id: int, skip: int = 0, limit: int = 100):
-        """Get orders for a customer"""
-        return db.query(Order).filter(Order.customer_id == customer_id).offset(skip).limit(limit).all()
+    def get_customer_orders(db: Session, customer_id: int, cursor: Optional[Cursor] = None, limit: int = 100):
+        """Get orders for a customer, newest first, after cursor"""
+        query = db.query(Order).filter(Order.customer_id == customer_id)
+        return keyset_page(query, Order, cursor, limit).all()
     
     @staticmethod
-    def expire_old_orders(db: Session) -> int:
+    def expire_old_orders(db: Session, batch_size: int = EXPIRE_BATCH_SIZE) -> int:
         """Expire orders that have passed their expiry time"""
-        expired_orders = db.query(Order).filter(
-            Order.status.in_([OrderStatus.PENDING_PAYMENT, OrderStatus.PAYMENT_SUBMITTED]),
-            Order.expires_at < datetime.utcnow()
-        ).all()
-        
+        expirable_states = [
+            s for s in (OrderStatus.PENDING_PAYMENT, OrderStatus.PAYMENT_SUBMITTED)
+            if can_transition(s, OrderStatus.EXPIRED)
+        ]
+        now = datetime.utcnow()
         count = 0
-        for order in expired_orders:
-            OrderService.transition_order_state(
-                db, order.id, OrderStatus.EXPIRED, "system", "Order expired"
-            )
-            count += 1
+        
+        # One short transaction per batch, so a large sweep never holds locks on
+        # every expired order at once. Claimed rows leave the filter, so no cursor
+        # is needed; going state by state tells us each row's from_state.
+        for state in expirable_states:
+            while True:
+                batch = select(Order.id).where(
+                    Order.status == state,
+                    Order.expires_at < now
+                ).order_by(Order.id).limit(batch_size)
+                # UPDATE ... RETURNING claims the rows atomically: only orders this
+                # statement actually moved get a transition, even with two sweepers
+                order_ids = db.execute(
+                    update(Order)
+                    .where(Order.id.in_(batch.scalar_subquery()), Order.status == state)
+                    .values(status=OrderStatus.EXPIRED, version_id=Order.version_id + 1)
+                    .returning(Order.id),
+                    execution_options={"synchronize_session": False}
+                ).scalars().all()
+                if not order_ids:
+                    break
+                
+                db.execute(insert(OrderStateTransition), [
+                    {
+                        "order_id": order_id,
+                        "from_state": state.value,
+                        "to_state": OrderStatus.EXPIRED.value,
+                        "reason": "Order expired",
+                        "performed_by": "system"
+                    }
+                    for order_id in order_ids
+                ])
+                db.commit()
+                count += len(order_ids)
+        
+        if count:
+            # Statuses changed in SQL; don't let loaded Order objects serve stale values
+            db.expire_all()
         
         logger.info(f"Expired {count} orders")
         return count
\ No newline at end of file
@@ -1,7 +1,9 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+from sqlalchemy import bindparam, func, lambda_stmt, select, update
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status, Depends
+from sqlalchemy.orm.util import identity_key
+from fastapi import HTTPException, status
 
 from ..models.order import Order, OrderStatus
 from ..models.order_item import OrderItem
@@ -10,7 +12,9 @@ from ..models.inventory import InventoryMovement, MovementType
 from ..schemas.order import OrderCreate, OrderUpdate, OrderStatusUpdate
 from ..schemas.order_item import OrderItemCreate, OrderItemType
 from ..core.auth import get_current_user
-from ..db.session import SessionLocal
+from ..db.session import SessionScoped
+from ..db.bulk import bulk_insert
+from ..fsm.order_states import can_transition
 from ..core.logging import setup_logging
 
 logger = setup_logging()
@@ -31,14 +35,31 @@ class OrderService:
         customer_id: Optional[str] = None
     ) -> List[Order]:
         """Retrieve a list of orders with optional filtering"""
-        query = self.db.query(Order)
+        stmt = lambda_stmt(lambda: select(Order))
         
         if status:
-            query = query.filter(Order.status == status)
+            stmt += lambda s: s.where(Order.status == status)
         if customer_id:
-            query = query.filter(Order.customer_id == customer_id)
+            stmt += lambda s: s.where(Order.customer_id == customer_id)
             
-        return query.offset(skip).limit(limit).all()
+        stmt += lambda s: s.offset(skip).limit(limit)
+        return self.db.execute(stmt).scalars().all()
+
+    def count_orders(
+        self,
+        status: Optional[OrderStatus] = None,
+        customer_id: Optional[str] = None
+    ) -> int:
+        """Count orders matching the same filters as get_orders"""
+        # A plain COUNT in the database; no rows are fetched or wrapped in a subquery
+        stmt = lambda_stmt(lambda: select(func.count(Order.id)))
+        
+        if status:
+            stmt += lambda s: s.where(Order.status == status)
+        if customer_id:
+            stmt += lambda s: s.where(Order.customer_id == customer_id)
+            
+        return self.db.execute(stmt).scalar_one()
 
     def create_order(self, order_data: OrderCreate, user_id: str) -> Order:
         """Create a new order with order items"""
@@ -60,8 +81,11 @@ class OrderService:
         
         # Process order items
         subtotal = 0
+        # One query for every product in the order
+        product_ids = {item.product_id for item in order_data.items}
+        products = {p.id: p for p in self.db.query(Product).filter(Product.id.in_(product_ids)).all()}
         for item_data in order_data.items:
-            product = self.db.query(Product).filter(Product.id == item_data.product_id).first()
+            product = products.get(item_data.product_id)
             if not product:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -111,7 +135,6 @@ class OrderService:
         db_order.status = OrderStatus.PENDING_PAYMENT
         
         self.db.commit()
-        self.db.refresh(db_order)
         return db_order
 
     def update_order_status(
@@ -128,23 +151,11 @@ class OrderService:
                 detail="Order not found"
             )
             
-        # Validate status transition
-        valid_transitions = {
-            OrderStatus.DRAFT: [OrderStatus.PENDING_PAYMENT, OrderStatus.CANCELLED],
-            OrderStatus.PENDING_PAYMENT: [OrderStatus.PAID, OrderStatus.CANCELLED],
-            OrderStatus.PAID: [OrderStatus.PROCESSING, OrderStatus.REFUNDED],
-            OrderStatus.PROCESSING: [OrderStatus.SHIPPED, OrderStatus.COMPLETED],
-            OrderStatus.SHIPPED: [OrderStatus.DELIVERED, OrderStatus.RETURNED],
-            OrderStatus.DELIVERED: [OrderStatus.COMPLETED, OrderStatus.RETURNED],
-            OrderStatus.CANCELLED: [],
-            OrderStatus.REFUNDED: [],
-            OrderStatus.RETURNED: [OrderStatus.REFUNDED]
-        }
-        
         current_status = db_order.status
         new_status = status_update.status
         
-        if new_status not in valid_transitions.get(current_status, []):
+        # Validate status transition against the shared order FSM table
+        if not can_transition(current_status, new_status):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid status transition from {current_status} to {new_status}"
@@ -162,7 +173,6 @@ class OrderService:
             self._handle_order_refund(db_order, user_id)
         
         self.db.commit()
-        self.db.refresh(db_order)
         return db_order
 
     def _update_inventory(
@@ -191,49 +201,80 @@ class OrderService:
         )
         self.db.add(transaction)
         
-        # Update product stock
-        product = self.db.query(Product).filter(Product.id == product_id).with_for_update().first()
-        if product:
-            product.stock_quantity = (product.stock_quantity or 0) + quantity
-            if product.stock_quantity < 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Insufficient stock for product {product_id}"
-                )
+        # Update product stock in one atomic UPDATE guarded against going negative
+        new_stock = func.coalesce(Product.stock_quantity, 0) + quantity
+        row = self.db.execute(
+            update(Product)
+            .where(Product.id == product_id, new_stock >= 0)
+            .values(stock_quantity=new_stock)
+            .returning(Product.id),
+            execution_options={"synchronize_session": "fetch"}
+        ).first()
+        if row is None and self.db.get(Product, product_id) is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Insufficient stock for product {product_id}"
+            )
+
+    def _restock_order_items(self, order: Order, notes: str, user_id: str) -> None:
+        """Put an order's physical items back into stock in one batch"""
+        # One query for the items, locking their product rows in id order so
+        # concurrent restocks can't deadlock on each other
+        items = (
+            self.db.query(OrderItem.product_id, OrderItem.quantity)
+            .join(Product, Product.id == OrderItem.product_id)
+            .filter(OrderItem.order_id == order.id, Product.product_type == ProductType.PHYSICAL)
+            .order_by(Product.id)
+            .with_for_update(of=Product)
+            .all()
+        )
+        if not items:
+            return
+        
+        restock_by_product: Dict[int, int] = {}
+        for product_id, quantity in items:
+            restock_by_product[product_id] = restock_by_product.get(product_id, 0) + quantity
+        
+        product_table = Product.__table__
+        self.db.execute(
+            product_table.update()
+            .where(product_table.c.id == bindparam("pid"))
+            .values(stock_quantity=func.coalesce(product_table.c.stock_quantity, 0) + bindparam("delta")),
+            [{"pid": pid, "delta": delta} for pid, delta in restock_by_product.items()]
+        )
+        # Stock moved in SQL; expire just the loaded products' stock, since
+        # expire_all would also drop the caller's unflushed order changes
+        for product_id in restock_by_product:
+            product = self.db.identity_map.get(identity_key(Product, product_id))
+            if product is not None:
+                self.db.expire(product, ["stock_quantity"])
+        bulk_insert(self.db, InventoryMovement, [
+            {
+                "product_id": product_id,
+                "movement_type": MovementType.INBOUND,
+                "quantity": quantity,
+                "reference": str(order.id),
+                "notes": notes,
+                "performed_by": user_id
+            }
+            for product_id, quantity in items
+        ])
 
     def _handle_order_cancellation(self, order: Order, user_id: str) -> None:
         """Handle order cancellation by restoring inventory"""
         if order.status != OrderStatus.CANCELLED:
             return
-            
-        for item in order.items:
-            if item.product_type == ProductType.PHYSICAL:
-                self._update_inventory(
-                    product_id=item.product_id,
-                    quantity=item.quantity,  # Positive to add back to inventory
-                    reference_id=order.id,
-                    reference_type="order_cancellation",
-                    notes=f"Order {order.id} cancellation",
-                    user_id=user_id
-                )
+        
+        self._restock_order_items(order, f"Order {order.id} cancellation", user_id)
 
     def _handle_order_refund(self, order: Order, user_id: str) -> None:
         """Handle order refund and update inventory if needed"""
         if order.status != OrderStatus.REFUNDED:
             return
-            
+        
         # For physical products, we might want to restock on refund
-        for item in order.items:
-            if item.product_type == ProductType.PHYSICAL:
-                self._update_inventory(
-                    product_id=item.product_id,
-                    quantity=item.quantity,  # Positive to add back to inventory
-                    reference_id=order.id,
-                    reference_type="order_refund",
-                    notes=f"Order {order.id} refund",
-                    user_id=user_id
-                )
+        self._restock_order_items(order, f"Order {order.id} refund", user_id)
 
 # Dependency
-def get_order_service(db: Session = Depends(SessionLocal)) -> OrderService:
-    return OrderService(db)
+def get_order_service() -> OrderService:
+    return OrderService(SessionScoped())
@@ -1,13 +1,14 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, case, lambda_stmt, select, update
+from sqlalchemy.orm.util import identity_key
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-import uuid
 
-from app.models.payment import Payment
+from app.models.payment import Payment, PaymentStatus
 from app.models.order import Order
 from app.schemas.payment import PaymentCreate, PaymentUpdate
 from app.core.logging import setup_logging
+from app.utils.ids import generate_reference
 
 logger = setup_logging()
 
@@ -31,7 +32,7 @@ class PaymentService:
             raise ValueError(f"Order {payment_data.order_id} not found")
 
         # Generate payment reference
-        payment_reference = f"PAY-{datetime.now().strftime('%Y%m%d')}-{uuid.uuid4().hex[:8].upper()}"
+        payment_reference = generate_reference("PAY")
 
         payment = Payment(
             order_id=payment_data.order_id,
@@ -44,7 +45,6 @@ class PaymentService:
 
         db.add(payment)
         db.commit()
-        db.refresh(payment)
 
         logger.info(f"Created payment {payment.id} for order {payment_data.order_id}")
         return payment
@@ -52,29 +52,38 @@ class PaymentService:
     @staticmethod
     def update_payment(db: Session, payment_id: str, payment_data: PaymentUpdate) -> Payment:
         """Update a payment"""
-        payment = db.query(Payment).filter(Payment.id == payment_id).first()
-        if not payment:
+        values = payment_data.dict(exclude_unset=True)
+
+        # Handle status changes; explicitly sent fields still win
+        new_status = values.get('status')
+        if new_status == PaymentStatus.VERIFIED:
+            # Stamp the time only on the move into verified, decided in the UPDATE itself
+            # TODO: Set verified_by from current user
+            values.setdefault('verified_at', case(
+                (Payment.status != PaymentStatus.VERIFIED, datetime.utcnow()),
+                else_=Payment.verified_at
+            ))
+        elif new_status == PaymentStatus.REJECTED:
+            values.setdefault('rejection_reason', None)
+
+        if not values:
+            payment = db.get(Payment, payment_id)
+            if not payment:
+                raise ValueError(f"Payment {payment_id} not found")
+            return payment
+
+        # Old status only if the session already holds it (no lazy load); RETURNING gives the new one
+        loaded = db.identity_map.get(identity_key(Payment, payment_id))
+        old_status = vars(loaded).get('status') if loaded is not None else None
+
+        # "fetch" rides on this RETURNING (it carries the PK), so a loaded Payment is refreshed in place
+        payment = db.execute(
+            update(Payment).where(Payment.id == payment_id).values(values).returning(Payment),
+            execution_options={"synchronize_session": "fetch"},
+        ).scalar_one_or_none()
+        if payment is None:
             raise ValueError(f"Payment {payment_id} not found")
-
-        update_data = payment_data.dict(exclude_unset=True)
-
-        # Handle status changes
-        if 'status' in update_data:
-            old_status = payment.status
-            new_status = update_data['status']
-
-            if new_status == "verified" and old_status != "verified":
-                payment.verified_at = datetime.utcnow()
-                # TODO: Set verified_by from current user
-            elif new_status == "rejected":
-                payment.rejection_reason = update_data.get('rejection_reason')
-
-        for field, value in update_data.items():
-            if hasattr(payment, field):
-                setattr(payment, field, value)
-
         db.commit()
-        db.refresh(payment)
 
         logger.info(f"Updated payment {payment_id} status: {old_status} -> {payment.status}")
         return payment
@@ -108,40 +117,39 @@ class PaymentService:
         end_date: Optional[datetime] = None
     ) -> List[Payment]:
         """Get payments with optional filters"""
-        query = db.query(Payment)
+        stmt = lambda_stmt(lambda: select(Payment))
 
         if order_id:
-            query = query.filter(Payment.order_id == order_id)
+            stmt += lambda s: s.where(Payment.order_id == order_id)
         if status:
-            query = query.filter(Payment.status == status)
+            stmt += lambda s: s.where(Payment.status == status)
         if payment_method:
-            query = query.filter(Payment.payment_method == payment_method)
+            stmt += lambda s: s.where(Payment.payment_method == payment_method)
         if start_date:
-            query = query.filter(Payment.created_at >= start_date)
+            stmt += lambda s: s.where(Payment.created_at >= start_date)
         if end_date:
-            query = query.filter(Payment.created_at <= end_date)
+            stmt += lambda s: s.where(Payment.created_at <= end_date)
 
-        return query.offset(skip).limit(limit).all()
+        stmt += lambda s: s.offset(skip).limit(limit)
+        return db.execute(stmt).scalars().all()
 
     @staticmethod
     def get_payment_stats(db: Session) -> Dict[str, Any]:
         """Get payment statistics"""
         from sqlalchemy import func
 
+        # One scan: per-status counts ride along as filtered aggregates
         stats = db.query(
             func.count(Payment.id).label('total_payments'),
             func.sum(Payment.amount).label('total_amount'),
-            func.avg(Payment.amount).label('avg_amount')
-        ).first()
-
-        status_counts = db.query(
-            Payment.status,
-            func.count(Payment.id).label('count')
-        ).group_by(Payment.status).all()
+            func.avg(Payment.amount).label('avg_amount'),
+            *[func.count(Payment.id).filter(Payment.status == status).label(status.value)
+              for status in PaymentStatus]
+        ).one()
 
         return {
             'total_payments': stats.total_payments or 0,
             'total_amount': float(stats.total_amount or 0),
             'avg_amount': float(stats.avg_amount or 0),
-            'status_breakdown': {status.value: count for status, count in status_counts}
+            'status_breakdown': {status.value: stats._mapping[status.value] for status in PaymentStatus}
 }
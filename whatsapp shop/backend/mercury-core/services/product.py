@@ -1,3 +1,4 @@
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import uuid
@@ -7,6 +8,18 @@ from app.core.logging import setup_logging
 
 logger = setup_logging()
 
+# Columns update_product may write; anything else in kwargs is ignored
+ALLOWED_PRODUCT_UPDATE_FIELDS = frozenset(Product.__table__.columns.keys()) - {'id', 'created_at', 'updated_at'}
+
+
+def _low_stock_conditions(threshold: Optional[int]):
+    """Active physical products at or below their reorder level, or below threshold if given"""
+    return (
+        Product.product_type == ProductType.PHYSICAL,
+        Product.is_active == True,
+        (Product.stock_quantity <= threshold) if threshold else Product.is_low_stock
+    )
+
 class ProductService:
     
     @staticmethod
@@ -40,7 +53,6 @@ class ProductService:
         
         db.add(product)
         db.commit()
-        db.refresh(product)
         
         logger.info(f"Product created: {name} ({sku})")
         return product
@@ -66,40 +78,50 @@ class ProductService:
     ) -> List[Product]:
         """List products with filters"""
         
-        query = db.query(Product)
+        # Cached statement: each combination of filters compiles once, values bind per call
+        stmt = lambda_stmt(lambda: select(Product))
         
         if active_only:
-            query = query.filter(Product.is_active == True)
+            stmt += lambda s: s.where(Product.is_active == True)
         
         if category:
-            query = query.filter(Product.category == category)
+            stmt += lambda s: s.where(Product.category == category)
         
         if product_type:
-            query = query.filter(Product.product_type == product_type)
+            stmt += lambda s: s.where(Product.product_type == product_type)
         
-        return query.offset(skip).limit(limit).all()
+        stmt += lambda s: s.offset(skip).limit(limit)
+        return db.execute(stmt).scalars().all()
     
     @staticmethod
-    def update_product(
-        db: Session,
-        product_id: int,
-        **kwargs
-    ) -> Optional[Product]:
+    def update_product(db: Session, product_id: int, **kwargs) -> Optional[Product]:
         """Update product"""
         
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product:
+        if not ProductService.update_product_fields(db, product_id, **kwargs):
             return None
+        return db.get(Product, product_id)
+    
+    @staticmethod
+    def update_product_fields(db: Session, product_id: int, **kwargs) -> bool:
+        """Update product without loading it; returns whether it exists"""
         
-        for key, value in kwargs.items():
-            if hasattr(product, key) and value is not None:
-                setattr(product, key, value)
+        values = {
+            key: value for key, value in kwargs.items()
+            if key in ALLOWED_PRODUCT_UPDATE_FIELDS and value is not None
+        }
         
-        db.commit()
-        db.refresh(product)
+        if not values:
+            return db.get(Product, product_id) is not None
         
-        logger.info(f"Product updated: {product.name}")
-        return product
+        # One UPDATE, no SELECT first
+        updated = db.query(Product).filter(Product.id == product_id).update(
+            values, synchronize_session="fetch"
+        )
+        if not updated:
+            return False
+        db.commit()
+        logger.info(f"Product updated: {product_id}")
+        return True
     
     @staticmethod
     def deactivate_product(db: Session, product_id: int) -> bool:
@@ -119,14 +141,14 @@ class ProductService:
     def get_low_stock_products(db: Session, threshold: Optional[int] = None) -> List[Product]:
         """Get products below reorder level"""
         
-        query = db.query(Product).filter(
-            Product.product_type == ProductType.PHYSICAL,
-            Product.is_active == True
-        )
-        
-        if threshold:
-            query = query.filter(Product.stock_quantity <= threshold)
-        else:
-            query = query.filter(Product.stock_quantity <= Product.reorder_level)
-        
-        return query.all()
\ No newline at end of file
+        return db.query(Product).filter(*_low_stock_conditions(threshold)).all()
+    
+    @staticmethod
+    def get_low_stock_rows(db: Session, threshold: Optional[int] = None) -> List[dict]:
+        """Low stock products as id/name/stock_quantity/reorder_level rows"""
+        
+        # Alerts only need a few columns; skip hydrating whole Product rows
+        stmt = select(
+            Product.id, Product.name, Product.stock_quantity, Product.reorder_level
+        ).where(*_low_stock_conditions(threshold))
+        return db.execute(stmt).mappings().all()
\ No newline at end of file
@@ -1,20 +1,36 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, extract
+from sqlalchemy import case, func, and_, or_, extract, literal_column, select
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-from collections import defaultdict
 
 from app.models.order import Order
-from app.models.payment import Payment
+from app.models.payment import Payment, PaymentStatus
 from app.models.product import Product
 from app.models.transaction import Transaction, TransactionType
-from app.models.account import Account, AccountType
+from app.models.account import AccountType
 from app.services.accounting import AccountingService
 from app.core.logging import setup_logging
 
 logger = setup_logging()
 
+_REPORT_PERIODS = ("day", "week", "month")
+
 class ReportService:
+    @staticmethod
+    def _period_bucket(db: Session, column, group_by: str):
+        """SQL expression naming the day (YYYY-MM-DD), week (its Monday) or month (YYYY-MM) of column"""
+        if group_by not in _REPORT_PERIODS:
+            return literal_column("'total'")
+        if db.get_bind().dialect.name == "postgresql":
+            fmt = "YYYY-MM" if group_by == "month" else "YYYY-MM-DD"
+            return func.to_char(func.date_trunc(group_by, column), fmt)
+        # SQLite has no date_trunc; its date modifiers give the same keys
+        if group_by == "day":
+            return func.date(column)
+        if group_by == "week":
+            return func.date(column, "-6 days", "weekday 1")
+        return func.strftime("%Y-%m", column)
+
     @staticmethod
     def get_sales_report(
         db: Session,
@@ -23,32 +39,27 @@ class ReportService:
         group_by: str = "day"  # day, week, month
     ) -> Dict[str, Any]:
         """Generate sales report"""
-        # Get orders in date range
-        orders = db.query(Order).filter(
+        # Orders and revenue per period, bucketed and summed by the database
+        bucket = ReportService._period_bucket(db, Order.created_at, group_by)
+        query = db.query(
+            bucket,
+            func.count(Order.id),
+            func.coalesce(func.sum(Order.total_amount), 0)
+        ).filter(
             and_(Order.created_at >= start_date, Order.created_at <= end_date)
-        ).all()
-
-        total_orders = len(orders)
-        total_revenue = sum(order.total_amount for order in orders if order.total_amount)
-
-        # Group by time period
-        grouped_data = defaultdict(lambda: {'orders': 0, 'revenue': 0.0})
-
-        for order in orders:
-            if group_by == "day":
-                key = order.created_at.date().isoformat()
-            elif group_by == "week":
-                # Get week start (Monday)
-                week_start = order.created_at.date() - timedelta(days=order.created_at.weekday())
-                key = week_start.isoformat()
-            elif group_by == "month":
-                key = f"{order.created_at.year}-{order.created_at.month:02d}"
-            else:
-                key = "total"
-
-            grouped_data[key]['orders'] += 1
-            if order.total_amount:
-                grouped_data[key]['revenue'] += order.total_amount
+        )
+        if group_by in _REPORT_PERIODS:
+            query = query.group_by(bucket)
+        rows = query.all()
+
+        # One pass builds the buckets and the running totals together
+        grouped_data = {}
+        total_orders = total_revenue = 0
+        for key, count, revenue in rows:
+            if count:
+                grouped_data[key] = {'orders': count, 'revenue': revenue}
+            total_orders += count
+            total_revenue += revenue
 
         return {
             'period': {'start': start_date, 'end': end_date},
@@ -57,7 +68,7 @@ class ReportService:
                 'total_revenue': total_revenue,
                 'avg_order_value': total_revenue / total_orders if total_orders > 0 else 0
             },
-            'data': dict(grouped_data),
+            'data': grouped_data,
             'grouped_by': group_by
         }
 
@@ -68,26 +79,30 @@ class ReportService:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Generate payment report"""
-        payments = db.query(Payment).filter(
-            and_(Payment.created_at >= start_date, Payment.created_at <= end_date)
-        ).all()
-
-        total_payments = len(payments)
-        total_amount = sum(payment.amount for payment in payments)
+        in_period = and_(Payment.created_at >= start_date, Payment.created_at <= end_date)
 
         # Group by payment method
-        method_summary = defaultdict(lambda: {'count': 0, 'amount': 0.0})
-
-        for payment in payments:
-            method = payment.payment_method.value if hasattr(payment.payment_method, 'value') else str(payment.payment_method)
-            method_summary[method]['count'] += 1
-            method_summary[method]['amount'] += payment.amount
+        by_method = db.query(
+            Payment.payment_method,
+            func.count(Payment.id),
+            func.coalesce(func.sum(Payment.amount), 0)
+        ).filter(in_period).group_by(Payment.payment_method).all()
+        method_summary = {}
+        total_payments = total_amount = 0
+        for method, count, amount in by_method:
+            # Legacy rows can hold NULL here; report them rather than fail
+            method_summary[method.value if method is not None else 'unknown'] = {'count': count, 'amount': amount}
+            total_payments += count
+            total_amount += amount
 
         # Group by status
-        status_summary = defaultdict(int)
-        for payment in payments:
-            status = payment.status.value if hasattr(payment.status, 'value') else str(payment.status)
-            status_summary[status] += 1
+        by_status = db.query(
+            Payment.status,
+            func.count(Payment.id)
+        ).filter(in_period).group_by(Payment.status).all()
+        status_summary = {
+            status.value if status is not None else 'unknown': count for status, count in by_status
+        }
 
         return {
             'period': {'start': start_date, 'end': end_date},
@@ -95,30 +110,34 @@ class ReportService:
                 'total_payments': total_payments,
                 'total_amount': total_amount
             },
-            'by_method': dict(method_summary),
-            'by_status': dict(status_summary)
+            'by_method': method_summary,
+            'by_status': status_summary
         }
 
     @staticmethod
     def get_inventory_report(db: Session) -> Dict[str, Any]:
         """Generate inventory report"""
-        products = db.query(Product).all()
-
-        total_products = len(products)
-        in_stock = sum(1 for p in products if p.inventory_quantity > 0)
-        out_of_stock = sum(1 for p in products if p.inventory_quantity <= 0)
-        low_stock = sum(1 for p in products if p.reorder_level and p.inventory_quantity <= p.reorder_level)
-
-        total_value = sum(p.price * p.inventory_quantity for p in products if p.inventory_quantity)
-
-        # Group by category
-        category_summary = defaultdict(lambda: {'count': 0, 'value': 0.0, 'quantity': 0})
-
-        for product in products:
-            category = product.category or 'Uncategorized'
-            category_summary[category]['count'] += 1
-            category_summary[category]['quantity'] += product.inventory_quantity or 0
-            category_summary[category]['value'] += (product.price or 0) * (product.inventory_quantity or 0)
+        # One pass over products, grouped by category; the summary is summed from those rows
+        category = func.coalesce(Product.category, 'Uncategorized')
+        quantity = func.coalesce(Product.stock_quantity, 0)
+        rows = db.query(
+            category,
+            func.count(Product.id),
+            func.coalesce(func.sum(quantity), 0),
+            func.coalesce(func.sum(func.coalesce(Product.selling_price, 0) * quantity), 0),
+            func.sum(case((quantity > 0, 1), else_=0)),
+            func.sum(case((Product.is_low_stock, 1), else_=0))
+        ).group_by(category).all()
+
+        category_summary = {}
+        total_products = in_stock = low_stock = total_value = 0
+        for name, count, qty, value, stocked, low in rows:
+            category_summary[name] = {'count': count, 'value': value, 'quantity': qty}
+            total_products += count
+            in_stock += stocked
+            low_stock += low
+            total_value += value
+        out_of_stock = total_products - in_stock
 
         return {
             'summary': {
@@ -128,7 +147,27 @@ class ReportService:
                 'low_stock': low_stock,
                 'total_value': total_value
             },
-            'by_category': dict(category_summary)
+            'by_category': category_summary
+        }
+
+    @staticmethod
+    def _side_sums(db: Session, account_ids: list, *conditions) -> Dict[int, tuple]:
+        """{account_id: (debits, credits)} for the given accounts in a single grouped query"""
+        if not account_ids:
+            return {}
+        debit_sum = func.sum(case(
+            (Transaction.transaction_type == TransactionType.DEBIT, Transaction.amount), else_=0
+        ))
+        credit_sum = func.sum(case(
+            (Transaction.transaction_type == TransactionType.CREDIT, Transaction.amount), else_=0
+        ))
+        return {
+            account_id: (debits, credits)
+            for account_id, debits, credits in db.query(
+                Transaction.account_id, debit_sum, credit_sum
+            ).filter(
+                Transaction.account_id.in_(account_ids), *conditions
+            ).group_by(Transaction.account_id).all()
         }
 
     @staticmethod
@@ -138,146 +177,64 @@ class ReportService:
         end_date: datetime
     ) -> Dict[str, Any]:
         """Generate profit & loss report"""
-        # Revenue accounts (income)
-        revenue_accounts = db.query(Account).filter(Account.account_type == AccountType.INCOME).all()
-        revenue_total = 0
-
-        for account in revenue_accounts:
-            credits = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.account_id == account.id,
-                    Transaction.transaction_type == TransactionType.CREDIT,
-                    Transaction.transaction_date >= start_date,
-                    Transaction.transaction_date <= end_date
-                )
-            ).scalar() or 0
-            revenue_total += credits
-
-        # Expense accounts
-        expense_accounts = db.query(Account).filter(Account.account_type == AccountType.EXPENSE).all()
-        expense_total = 0
-
-        for account in expense_accounts:
-            debits = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.account_id == account.id,
-                    Transaction.transaction_type == TransactionType.DEBIT,
-                    Transaction.transaction_date >= start_date,
-                    Transaction.transaction_date <= end_date
-                )
-            ).scalar() or 0
-            expense_total += debits
+        # Account metadata comes from the cache; only the transactions are aggregated
+        revenue_accounts = AccountingService.get_accounts_by_type(db, AccountType.INCOME)
+        expense_accounts = AccountingService.get_accounts_by_type(db, AccountType.EXPENSE)
+
+        # Income and expense activity for the period in one round-trip
+        sums = ReportService._side_sums(
+            db,
+            [account[0] for account in revenue_accounts + expense_accounts],
+            Transaction.transaction_date >= start_date,
+            Transaction.transaction_date <= end_date
+        )
+        # Revenue is what was credited to income accounts, expenses what was debited to expense accounts
+        revenue_total = sum(sums[account[0]][1] for account in revenue_accounts if account[0] in sums)
+        expense_total = sum(sums[account[0]][0] for account in expense_accounts if account[0] in sums)
 
         net_profit = revenue_total - expense_total
 
+        # Accounts with no activity are still listed
         return {
             'period': {'start': start_date, 'end': end_date},
             'revenue': revenue_total,
             'expenses': expense_total,
             'net_profit': net_profit,
-            'revenue_accounts': [{'id': a.id, 'name': a.name, 'code': a.code} for a in revenue_accounts],
-            'expense_accounts': [{'id': a.id, 'name': a.name, 'code': a.code} for a in expense_accounts]
+            'revenue_accounts': [{'id': i, 'name': name, 'code': code} for i, name, code in revenue_accounts],
+            'expense_accounts': [{'id': i, 'name': name, 'code': code} for i, name, code in expense_accounts]
         }
 
     @staticmethod
     def get_balance_sheet_report(db: Session, as_of_date: datetime) -> Dict[str, Any]:
         """Generate balance sheet report"""
-        # Assets
-        asset_accounts = db.query(Account).filter(Account.account_type == AccountType.ASSET).all()
-        total_assets = 0
-
-        asset_details = []
-        for account in asset_accounts:
-            # Calculate balance as of date
-            debits = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.account_id == account.id,
-                    Transaction.transaction_type == TransactionType.DEBIT,
-                    Transaction.transaction_date <= as_of_date
-                )
-            ).scalar() or 0
-
-            credits = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.account_id == account.id,
-                    Transaction.transaction_type == TransactionType.CREDIT,
-                    Transaction.transaction_date <= as_of_date
-                )
-            ).scalar() or 0
-
-            balance = debits - credits
-            total_assets += balance
-
-            asset_details.append({
-                'id': account.id,
-                'name': account.name,
-                'code': account.code,
-                'balance': balance
-            })
-
-        # Liabilities
-        liability_accounts = db.query(Account).filter(Account.account_type == AccountType.LIABILITY).all()
-        total_liabilities = 0
-
-        liability_details = []
-        for account in liability_accounts:
-            credits = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.account_id == account.id,
-                    Transaction.transaction_type == TransactionType.CREDIT,
-                    Transaction.transaction_date <= as_of_date
-                )
-            ).scalar() or 0
-
-            debits = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.account_id == account.id,
-                    Transaction.transaction_type == TransactionType.DEBIT,
-                    Transaction.transaction_date <= as_of_date
-                )
-            ).scalar() or 0
-
-            balance = credits - debits
-            total_liabilities += balance
-
-            liability_details.append({
-                'id': account.id,
-                'name': account.name,
-                'code': account.code,
-                'balance': balance
-            })
-
-        # Equity
-        equity_accounts = db.query(Account).filter(Account.account_type == AccountType.EQUITY).all()
-        total_equity = 0
-
-        equity_details = []
-        for account in equity_accounts:
-            credits = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.account_id == account.id,
-                    Transaction.transaction_type == TransactionType.CREDIT,
-                    Transaction.transaction_date <= as_of_date
-                )
-            ).scalar() or 0
-
-            debits = db.query(func.sum(Transaction.amount)).filter(
-                and_(
-                    Transaction.account_id == account.id,
-                    Transaction.transaction_type == TransactionType.DEBIT,
-                    Transaction.transaction_date <= as_of_date
-                )
-            ).scalar() or 0
-
-            balance = credits - debits
-            total_equity += balance
-
-            equity_details.append({
-                'id': account.id,
-                'name': account.name,
-                'code': account.code,
-                'balance': balance
-            })
+        accounts = {
+            account_type: AccountingService.get_accounts_by_type(db, account_type)
+            for account_type in (AccountType.ASSET, AccountType.LIABILITY, AccountType.EQUITY)
+        }
+        account_ids = [account[0] for rows in accounts.values() for account in rows]
+
+        # Debit and credit sums for every balance-sheet account in one grouped query
+        sums = ReportService._side_sums(db, account_ids, Transaction.transaction_date <= as_of_date)
+
+        details = {AccountType.ASSET: [], AccountType.LIABILITY: [], AccountType.EQUITY: []}
+        for account_type, rows in accounts.items():
+            for account_id, name, code in rows:
+                debits, credits = sums.get(account_id, (0, 0))
+                # Assets are debit-normal; liabilities and equity are credit-normal
+                balance = debits - credits if account_type == AccountType.ASSET else credits - debits
+                details[account_type].append({
+                    'id': account_id,
+                    'name': name,
+                    'code': code,
+                    'balance': balance
+                })
+
+        asset_details = details[AccountType.ASSET]
+        liability_details = details[AccountType.LIABILITY]
+        equity_details = details[AccountType.EQUITY]
+        total_assets = sum(a['balance'] for a in asset_details)
+        total_liabilities = sum(a['balance'] for a in liability_details)
+        total_equity = sum(a['balance'] for a in equity_details)
 
         return {
             'as_of_date': as_of_date,
@@ -299,38 +256,38 @@ class ReportService:
     @staticmethod
     def get_dashboard_metrics(db: Session) -> Dict[str, Any]:
         """Get key metrics for dashboard"""
-        # Today's sales
-        today = datetime.utcnow().date()
-        today_start = datetime(today.year, today.month, today.day)
-        today_end = today_start + timedelta(days=1)
-
-        today_orders = db.query(func.count(Order.id)).filter(
-            and_(Order.created_at >= today_start, Order.created_at < today_end)
-        ).scalar() or 0
-
-        today_revenue = db.query(func.sum(Order.total_amount)).filter(
-            and_(Order.created_at >= today_start, Order.created_at < today_end)
-        ).scalar() or 0
-
-        # This month's metrics
-        month_start = datetime(today.year, today.month, 1)
-        month_orders = db.query(func.count(Order.id)).filter(
-            Order.created_at >= month_start
-        ).scalar() or 0
+        # Period boundaries, all derived from one clock read
+        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow_start = today_start + timedelta(days=1)
+        month_start = today_start.replace(day=1)
 
-        month_revenue = db.query(func.sum(Order.total_amount)).filter(
-            Order.created_at >= month_start
-        ).scalar() or 0
+        is_today = and_(Order.created_at >= today_start, Order.created_at < tomorrow_start)
 
         # Pending payments
-        pending_payments = db.query(func.count(Payment.id)).filter(
-            Payment.status == 'pending'
-        ).scalar() or 0
+        pending_payments = select(func.count(Payment.id)).where(
+            Payment.status == PaymentStatus.PENDING
+        ).scalar_subquery()
 
         # Low stock items
-        low_stock = db.query(func.count(Product.id)).filter(
-            and_(Product.reorder_level.isnot(None), Product.inventory_quantity <= Product.reorder_level)
-        ).scalar() or 0
+        low_stock = select(func.count(Product.id)).where(Product.is_low_stock).scalar_subquery()
+
+        # Everything in one round-trip: the month's orders are scanned once, with
+        # today's figures as filtered aggregates and the other counts as subqueries
+        metrics = db.query(
+            func.count(Order.id).filter(is_today).label('today_orders'),
+            func.sum(Order.total_amount).filter(is_today).label('today_revenue'),
+            func.count(Order.id).label('month_orders'),
+            func.sum(Order.total_amount).label('month_revenue'),
+            pending_payments.label('pending_payments'),
+            low_stock.label('low_stock')
+        ).filter(Order.created_at >= month_start).one()
+
+        today_orders = metrics.today_orders or 0
+        today_revenue = metrics.today_revenue or 0
+        month_orders = metrics.month_orders or 0
+        month_revenue = metrics.month_revenue or 0
+        pending_payments = metrics.pending_payments or 0
+        low_stock = metrics.low_stock or 0
 
         return {
             'today': {
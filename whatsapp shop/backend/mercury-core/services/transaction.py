@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, case, func, select
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -112,51 +112,57 @@ class TransactionService:
         if not account:
             raise ValueError(f"Account {account_id} not found")
 
+        signed_amount = case(
+            (Transaction.transaction_type == TransactionType.DEBIT, Transaction.amount),
+            else_=-Transaction.amount
+        )
+
         # Get opening balance (transactions before start_date)
-        opening_debit = db.query(func.sum(Transaction.amount)).filter(
+        opening_balance_query = select(func.coalesce(func.sum(signed_amount), 0)).where(
             and_(
                 Transaction.account_id == account_id,
-                Transaction.transaction_type == TransactionType.DEBIT,
                 Transaction.transaction_date < start_date
             )
-        ).scalar() or 0
+        )
 
-        opening_credit = db.query(func.sum(Transaction.amount)).filter(
+        # Transactions in period with running balances from a window sum, in one query
+        in_order = (Transaction.transaction_date, Transaction.id)
+        opening = opening_balance_query.scalar_subquery()
+        rows = db.query(
+            Transaction.id,
+            Transaction.transaction_date,
+            Transaction.transaction_type,
+            Transaction.amount,
+            Transaction.description,
+            Transaction.reference,
+            opening.label('opening_balance'),
+            (opening + func.sum(signed_amount).over(order_by=in_order)).label('running_balance')
+        ).filter(
             and_(
                 Transaction.account_id == account_id,
-                Transaction.transaction_type == TransactionType.CREDIT,
-                Transaction.transaction_date < start_date
+                Transaction.transaction_date >= start_date,
+                Transaction.transaction_date <= end_date
             )
-        ).scalar() or 0
-
-        opening_balance = opening_debit - opening_credit
-
-        # Get transactions in period
-        transactions = TransactionService.get_transactions_by_account(
-            db, account_id, start_date, end_date
-        )
-
-        # Calculate running balances
-        running_balance = opening_balance
-        transaction_list = []
-
-        for transaction in transactions:
-            if transaction.transaction_type == TransactionType.DEBIT:
-                running_balance += transaction.amount
-            else:
-                running_balance -= transaction.amount
-
-            transaction_list.append({
-                'id': transaction.id,
-                'date': transaction.transaction_date,
-                'type': transaction.transaction_type.value,
-                'amount': float(transaction.amount),
-                'description': transaction.description,
-                'reference': transaction.reference,
-                'running_balance': running_balance
-            })
-
-        closing_balance = running_balance
+        ).order_by(*in_order).all()
+
+        transaction_list = [
+            {
+                'id': row.id,
+                'date': row.transaction_date,
+                'type': row.transaction_type.value,
+                'amount': float(row.amount),
+                'description': row.description,
+                'reference': row.reference,
+                'running_balance': row.running_balance
+            }
+            for row in rows
+        ]
+
+        if rows:
+            opening_balance = rows[0].opening_balance
+            closing_balance = rows[-1].running_balance
+        else:
+            opening_balance = closing_balance = db.execute(opening_balance_query).scalar()
 
         return {
             'account_id': account_id,
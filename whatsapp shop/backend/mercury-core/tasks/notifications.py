@@ -4,21 +4,61 @@ Notification tasks for sending various types of notifications.
 This module provides functionality to send different types of notifications
 including emails, SMS, and push notifications.
 """
+import asyncio
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
-from enum import Enum, auto
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+from functools import lru_cache
+from pathlib import Path
 import json
 
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound, Undefined
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
-class NotificationType(Enum):
-    """Types of notifications that can be sent."""
-    EMAIL = auto()
-    SMS = auto()
-    PUSH = auto()
-    WHATSAPP = auto()
+# Default cap on provider calls in flight at once from send_multiple
+SEND_CONCURRENCY = 32
+
+# Message templates ship with the image, so skip Jinja's per-render mtime check
+_template_env = Environment(
+    loader=FileSystemLoader(str(Path(__file__).parent.parent / "templates" / "messages")),
+    auto_reload=False
+)
+
+def _format_currency(value: Any) -> str:
+    """Jinja filter: $1,234.50; a missing value renders empty and a non-number as given"""
+    if value is None or isinstance(value, Undefined):
+        return ""
+    try:
+        return f"${value:,.2f}"
+    except (TypeError, ValueError):
+        return str(value)
+
+_template_env.filters["format_currency"] = _format_currency
+
+@lru_cache(maxsize=128)
+def _get_template(name: str) -> Optional[Template]:
+    """Load and compile a message template once; None (also cached) if there isn't one"""
+    try:
+        return _template_env.get_template(f"{name}.txt")
+    except TemplateNotFound:
+        return None
+
+class NotificationType(IntEnum):
+    """Types of notifications that can be sent.
+
+    Values are 1-based positions in NotificationService's provider tuple.
+    """
+    EMAIL = 1
+    SMS = 2
+    PUSH = 3
+    WHATSAPP = 4
 
 class NotificationPriority(Enum):
     """Priority levels for notifications."""
@@ -50,56 +90,48 @@ class NotificationTemplate(Enum):
     INVENTORY_ALERT = "inventory_alert"
     PROMOTIONAL = "promotional"
 
+@dataclass(slots=True, eq=False)
 class Notification:
-    """Represents a notification to be sent."""
+    """
+    Represents a notification to be sent.
     
-    def __init__(
-        self,
-        recipient: Union[str, List[str]],
-        template: NotificationTemplate,
-        context: Dict[str, Any],
-        notification_type: NotificationType = NotificationType.EMAIL,
-        priority: NotificationPriority = NotificationPriority.NORMAL,
-        subject: Optional[str] = None,
-        sender: Optional[str] = None,
-        reply_to: Optional[str] = None,
-        cc: Optional[List[str]] = None,
-        bcc: Optional[List[str]] = None,
-        attachments: Optional[List[Dict[str, Any]]] = None
-    ):
-        """
-        Initialize a notification.
-        
-        Args:
-            recipient: Email address, phone number, or user ID of the recipient
-            template: The notification template to use
-            context: Context data for the template
-            notification_type: Type of notification (email, SMS, etc.)
-            priority: Priority of the notification
-            subject: Subject line (for email)
-            sender: Sender's email/phone (optional)
-            reply_to: Reply-to address (for email)
-            cc: List of CC recipients (for email)
-            bcc: List of BCC recipients (for email)
-            attachments: List of attachments (for email)
-        """
-        if isinstance(recipient, str):
-            recipient = [recipient]
-        
-        self.recipient = recipient
-        self.template = template
-        self.context = context
-        self.notification_type = notification_type
-        self.priority = priority
-        self.subject = subject
-        self.sender = sender
-        self.reply_to = reply_to
-        self.cc = cc or []
-        self.bcc = bcc or []
-        self.attachments = attachments or []
-        self.status = NotificationStatus.PENDING
-        self.sent_at = None
-        self.metadata = {}
+    Slotted, since bulk sends keep thousands of these alive at once.
+    
+    Args:
+        recipient: Email address, phone number, or user ID of the recipient
+        template: The notification template to use
+        context: Context data for the template
+        notification_type: Type of notification (email, SMS, etc.)
+        priority: Priority of the notification
+        subject: Subject line (for email)
+        sender: Sender's email/phone (optional)
+        reply_to: Reply-to address (for email)
+        cc: List of CC recipients (for email)
+        bcc: List of BCC recipients (for email)
+        attachments: List of attachments (for email)
+    """
+    
+    recipient: Union[str, List[str]]
+    template: NotificationTemplate
+    context: Dict[str, Any]
+    notification_type: NotificationType = NotificationType.EMAIL
+    priority: NotificationPriority = NotificationPriority.NORMAL
+    subject: Optional[str] = None
+    sender: Optional[str] = None
+    reply_to: Optional[str] = None
+    cc: Optional[List[str]] = None
+    bcc: Optional[List[str]] = None
+    attachments: Optional[List[Dict[str, Any]]] = None
+    status: NotificationStatus = field(default=NotificationStatus.PENDING, init=False)
+    sent_at: Optional[datetime] = field(default=None, init=False)
+    metadata: Dict[str, Any] = field(default_factory=dict, init=False)
+    
+    def __post_init__(self):
+        if isinstance(self.recipient, str):
+            self.recipient = [self.recipient]
+        self.cc = self.cc or []
+        self.bcc = self.bcc or []
+        self.attachments = self.attachments or []
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert the notification to a dictionary."""
@@ -123,6 +155,58 @@ class Notification:
         """Return a string representation of the notification."""
         return f"<Notification {self.template.value} to {', '.join(self.recipient)}>"
 
+# Most recipients one provider call can take, for providers that deliver a shared
+# payload to each recipient separately (FCM multicast allows 500 tokens per call)
+PROVIDER_BATCH_LIMITS = {
+    NotificationType.PUSH: 500,
+}
+
+# String -> enum tables built once, so resolving request payloads is a dict hit
+# rather than an enum call that raises on a miss
+_TEMPLATE_LOOKUP = {t.value: t for t in NotificationTemplate}
+_TYPE_LOOKUP = {t.name: t for t in NotificationType}
+_PRIORITY_LOOKUP = {p.value: p for p in NotificationPriority}
+
+# Notification fields given as strings in bulk payloads: (field, table, case fold)
+_ENUM_FIELDS = (
+    ("template", _TEMPLATE_LOOKUP, str.lower),
+    ("notification_type", _TYPE_LOOKUP, str.upper),
+    ("priority", _PRIORITY_LOOKUP, str.lower),
+)
+
+# Successful bulk sends remembered per process, so a retried or doubly enqueued
+# batch doesn't message the same people twice: {content key: expires_at}
+DEDUPE_TTL = 300  # seconds
+DEDUPE_MAX_KEYS = 10_000
+_recent_sends: "OrderedDict[str, float]" = OrderedDict()
+
+def _dedupe_key(notification: "Notification") -> str:
+    """Content hash of who gets what, through which channel"""
+    payload = json.dumps(
+        [notification.recipient, notification.template.value, notification.context,
+         notification.notification_type.name],
+        sort_keys=True, default=str
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def _sent_recently(key: str, now: float) -> bool:
+    expires_at = _recent_sends.get(key)
+    return expires_at is not None and expires_at > now
+
+def _remember_sent(key: str, now: float) -> None:
+    _recent_sends[key] = now + DEDUPE_TTL
+    _recent_sends.move_to_end(key)
+    # Oldest entries go first once the cache is full
+    while len(_recent_sends) > DEDUPE_MAX_KEYS:
+        _recent_sends.popitem(last=False)
+
+def _lookup(table: Dict[str, Enum], value: str, fold) -> Optional[Enum]:
+    """Resolve a string to its enum member, trying the exact key before the case-folded one"""
+    member = table.get(value)
+    if member is None:
+        member = table.get(fold(value))
+    return member
+
 class NotificationService:
     """Service for sending notifications."""
     
@@ -134,12 +218,15 @@ class NotificationService:
             db_session: Database session/connection (optional)
         """
         self.db_session = db_session
-        self.providers = {
-            NotificationType.EMAIL: self._send_email,
-            NotificationType.SMS: self._send_sms,
-            NotificationType.PUSH: self._send_push,
-            NotificationType.WHATSAPP: self._send_whatsapp
-        }
+        # Indexed by NotificationType value - 1: send() dispatches with a tuple index
+        self._providers = (
+            self._send_email,
+            self._send_sms,
+            self._send_push,
+            self._send_whatsapp
+        )
+        # Kept for code that looks providers up by type
+        self.providers = dict(zip(NotificationType, self._providers))
     
     async def send(self, notification: Notification) -> bool:
         """
@@ -152,12 +239,13 @@ class NotificationService:
             True if the notification was sent successfully, False otherwise
         """
         try:
-            logger.info(f"Sending {notification.notification_type.name} notification: {notification}")
+            logger.info("Sending %s notification: %s", notification.notification_type.name, notification)
             
             # Get the appropriate sender function for the notification type
-            sender = self.providers.get(notification.notification_type)
-            if not sender:
-                raise ValueError(f"Unsupported notification type: {notification.notification_type}")
+            notification_type = notification.notification_type
+            if not isinstance(notification_type, NotificationType):
+                raise ValueError(f"Unsupported notification type: {notification_type}")
+            sender = self._providers[notification_type - 1]
             
             # Send the notification
             success = await sender(notification)
@@ -168,9 +256,9 @@ class NotificationService:
             
             # Log the result
             if success:
-                logger.info(f"Successfully sent notification: {notification}")
+                logger.info("Successfully sent notification: %s", notification)
             else:
-                logger.error(f"Failed to send notification: {notification}")
+                logger.error("Failed to send notification: %s", notification)
             
             # In a real implementation, you would save the notification to the database
             # await self._save_notification(notification)
@@ -178,7 +266,7 @@ class NotificationService:
             return success
             
         except Exception as e:
-            logger.error(f"Error sending notification {notification}: {str(e)}", exc_info=True)
+            logger.error("Error sending notification %s: %s", notification, e, exc_info=True)
             notification.status = NotificationStatus.FAILED
             notification.metadata["error"] = str(e)
             
@@ -187,27 +275,115 @@ class NotificationService:
             
             return False
     
-    async def send_multiple(self, notifications: List[Notification]) -> Dict[str, int]:
+    async def send_multiple(
+        self,
+        notifications: List[Notification],
+        max_concurrency: int = SEND_CONCURRENCY
+    ) -> Dict[str, int]:
         """
-        Send multiple notifications.
+        Send multiple notifications concurrently.
         
         Args:
             notifications: List of notifications to send
+            max_concurrency: Most provider calls allowed in flight at once
             
         Returns:
             Dictionary with counts of sent and failed notifications
         """
         results = {"total": len(notifications), "sent": 0, "failed": 0}
+        groups = self._group_for_batching(notifications)
         
-        for notification in notifications:
-            success = await self.send(notification)
-            if success:
-                results["sent"] += 1
+        # Sends are network-bound, so overlap them; the semaphore keeps a large
+        # batch from opening more provider connections than we can afford
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def send_one(group: List[Notification]) -> bool:
+            async with semaphore:
+                if len(group) == 1:
+                    return await self.send(group[0])
+                return await self._send_batch(group)
+        
+        outcomes = await asyncio.gather(
+            *(send_one(group) for group in groups),
+            return_exceptions=True
+        )
+        
+        for group, outcome in zip(groups, outcomes):
+            if outcome is True:
+                results["sent"] += len(group)
             else:
-                results["failed"] += 1
+                results["failed"] += len(group)
         
         return results
     
+    def _group_for_batching(self, notifications: List[Notification]) -> List[List[Notification]]:
+        """
+        Group notifications that one provider call can deliver together.
+        
+        Only types listed in PROVIDER_BATCH_LIMITS are grouped, and only when the
+        payload is identical; each group stays within the provider's recipient limit.
+        
+        Args:
+            notifications: List of notifications to send
+            
+        Returns:
+            Groups of notifications, in first-seen order
+        """
+        groups = []
+        open_groups = {}
+        
+        for notification in notifications:
+            limit = PROVIDER_BATCH_LIMITS.get(notification.notification_type)
+            if limit is None:
+                groups.append([notification])
+                continue
+            
+            key = (
+                notification.notification_type,
+                notification.template,
+                notification.subject,
+                notification.sender,
+                json.dumps(notification.context, sort_keys=True, default=str)
+            )
+            group = open_groups.get(key)
+            if group is None or sum(len(n.recipient) for n in group) + len(notification.recipient) > limit:
+                group = []
+                open_groups[key] = group
+                groups.append(group)
+            group.append(notification)
+        
+        return groups
+    
+    async def _send_batch(self, group: List[Notification]) -> bool:
+        """
+        Send a group of identical notifications as one provider call.
+        
+        Args:
+            group: Notifications sharing type, template, subject, sender and context
+            
+        Returns:
+            True if the batch was sent successfully, False otherwise
+        """
+        first = group[0]
+        batch = Notification(
+            recipient=[recipient for notification in group for recipient in notification.recipient],
+            template=first.template,
+            context=first.context,
+            notification_type=first.notification_type,
+            priority=max((n.priority for n in group), key=list(NotificationPriority).index),
+            subject=first.subject,
+            sender=first.sender
+        )
+        success = await self.send(batch)
+        
+        # Each original notification reports the outcome of the call that carried it
+        for notification in group:
+            notification.status = batch.status
+            notification.sent_at = batch.sent_at
+            notification.metadata.update(batch.metadata)
+        
+        return success
+    
     async def _send_email(self, notification: Notification) -> bool:
         """
         Send an email notification.
@@ -221,10 +397,7 @@ class NotificationService:
         # In a real implementation, this would use an email service like SendGrid,
         # Mailgun, or AWS SES to send the email
         try:
-            logger.info(
-                f"Sending email to {', '.join(notification.recipient)}: "
-                f"{notification.subject}"
-            )
+            logger.info("Sending email to %s: %s", notification.recipient, notification.subject)
             
             # Mock implementation - in a real app, this would actually send an email
             # For example, using SendGrid:
@@ -256,7 +429,7 @@ class NotificationService:
             return True
             
         except Exception as e:
-            logger.error(f"Error sending email: {str(e)}", exc_info=True)
+            logger.error("Error sending email: %s", e, exc_info=True)
             return False
     
     async def _send_sms(self, notification: Notification) -> bool:
@@ -272,7 +445,7 @@ class NotificationService:
         # In a real implementation, this would use an SMS service like Twilio,
         # Nexmo, or AWS SNS to send the SMS
         try:
-            logger.info(f"Sending SMS to {', '.join(notification.recipient)}")
+            logger.info("Sending SMS to %s", notification.recipient)
             
             # Mock implementation - in a real app, this would actually send an SMS
             # For example, using Twilio:
@@ -294,7 +467,7 @@ class NotificationService:
             return True
             
         except Exception as e:
-            logger.error(f"Error sending SMS: {str(e)}", exc_info=True)
+            logger.error("Error sending SMS: %s", e, exc_info=True)
             return False
     
     async def _send_push(self, notification: Notification) -> bool:
@@ -310,7 +483,7 @@ class NotificationService:
         # In a real implementation, this would use a push notification service
         # like Firebase Cloud Messaging (FCM) or Apple Push Notification Service (APNS)
         try:
-            logger.info(f"Sending push notification to {len(notification.recipient)} devices")
+            logger.info("Sending push notification to %d devices", len(notification.recipient))
             
             # Mock implementation - in a real app, this would actually send a push notification
             # For example, using FCM:
@@ -332,7 +505,7 @@ class NotificationService:
             return True
             
         except Exception as e:
-            logger.error(f"Error sending push notification: {str(e)}", exc_info=True)
+            logger.error("Error sending push notification: %s", e, exc_info=True)
             return False
     
     async def _send_whatsapp(self, notification: Notification) -> bool:
@@ -348,7 +521,7 @@ class NotificationService:
         # In a real implementation, this would use the WhatsApp Business API
         # or a service like Twilio for WhatsApp
         try:
-            logger.info(f"Sending WhatsApp message to {', '.join(notification.recipient)}")
+            logger.info("Sending WhatsApp message to %s", notification.recipient)
             
             # Mock implementation - in a real app, this would actually send a WhatsApp message
             # For example, using Twilio for WhatsApp:
@@ -370,10 +543,10 @@ class NotificationService:
             return True
             
         except Exception as e:
-            logger.error(f"Error sending WhatsApp message: {str(e)}", exc_info=True)
+            logger.error("Error sending WhatsApp message: %s", e, exc_info=True)
             return False
     
-    def _render_template(self, template_name: str, context: Dict[str, Any]) -> str:
+    def _render_template(self, template_name: Union[str, NotificationTemplate], context: Dict[str, Any]) -> str:
         """
         Render a notification template with the given context.
         
@@ -384,16 +557,15 @@ class NotificationService:
         Returns:
             Rendered template as a string
         """
-        # In a real implementation, this would use a templating engine like Jinja2
-        # to render the template with the provided context
-        # For example:
-        # from jinja2 import Environment, FileSystemLoader
-        # 
-        # env = Environment(loader=FileSystemLoader('templates/notifications'))
-        # template = env.get_template(f"{template_name}.html")
-        # return template.render(**context)
+        if isinstance(template_name, NotificationTemplate):
+            template_name = template_name.value
         
-        # For now, just return a simple string representation
+        # Parsed once per process; the hot path only renders
+        template = _get_template(template_name)
+        if template is not None:
+            return template.render(**context)
+        
+        # No message file for this template yet: fall back to a plain dump
         return f"[{template_name}] {json.dumps(context, indent=2)}"
 
 # Singleton instance
@@ -421,18 +593,18 @@ async def send_notification(
         True if the notification was sent successfully, False otherwise
     """
     if isinstance(template, str):
-        try:
-            template = NotificationTemplate(template)
-        except ValueError:
-            logger.error(f"Invalid template: {template}")
+        resolved = _lookup(_TEMPLATE_LOOKUP, template, str.lower)
+        if resolved is None:
+            logger.error("Invalid template: %s", template)
             return False
+        template = resolved
     
     if isinstance(notification_type, str):
-        try:
-            notification_type = NotificationType[notification_type.upper()]
-        except KeyError:
-            logger.error(f"Invalid notification type: {notification_type}")
+        resolved = _lookup(_TYPE_LOOKUP, notification_type, str.upper)
+        if resolved is None:
+            logger.error("Invalid notification type: %s", notification_type)
             return False
+        notification_type = resolved
     
     notification = Notification(
         recipient=recipient,
@@ -452,26 +624,51 @@ async def send_bulk_notifications(notifications: List[Dict[str, Any]]) -> Dict[s
         notifications: List of notification dictionaries
         
     Returns:
-        Dictionary with counts of sent and failed notifications
+        Dictionary with counts of sent, failed and deduplicated notifications
     """
     notification_objects = []
     
     for notification_data in notifications:
+        # Convert string values to enums; a bad value skips the item without raising
+        invalid = None
+        for field, table, fold in _ENUM_FIELDS:
+            value = notification_data.get(field)
+            if isinstance(value, str):
+                member = _lookup(table, value, fold)
+                if member is None:
+                    invalid = field
+                    break
+                notification_data[field] = member
+        
+        if invalid:
+            logger.error("Invalid %s in notification %s", invalid, notification_data)
+            continue
+        
         try:
-            # Convert string values to enums
-            if "template" in notification_data and isinstance(notification_data["template"], str):
-                notification_data["template"] = NotificationTemplate(notification_data["template"])
-            
-            if "notification_type" in notification_data and isinstance(notification_data["notification_type"], str):
-                notification_data["notification_type"] = NotificationType[notification_data["notification_type"].upper()]
-            
-            if "priority" in notification_data and isinstance(notification_data["priority"], str):
-                notification_data["priority"] = NotificationPriority(notification_data["priority"].lower())
-            
             notification = Notification(**notification_data)
             notification_objects.append(notification)
             
         except Exception as e:
-            logger.error(f"Error creating notification from {notification_data}: {str(e)}")
+            logger.error("Error creating notification from %s: %s", notification_data, e)
+    
+    # Skip anything already in this batch or successfully sent within DEDUPE_TTL
+    now = time.monotonic()
+    to_send = {}
+    for notification in notification_objects:
+        key = _dedupe_key(notification)
+        if key in to_send or _sent_recently(key, now):
+            logger.info("Skipping duplicate notification: %s", notification)
+            continue
+        to_send[key] = notification
+    
+    results = await notification_service.send_multiple(list(to_send.values()))
+    
+    # Only successful sends count as delivered; failures stay retryable
+    now = time.monotonic()
+    for key, notification in to_send.items():
+        if notification.status == NotificationStatus.SENT:
+            _remember_sent(key, now)
     
-    return await notification_service.send_multiple(notification_objects)
+    results["deduplicated"] = len(notification_objects) - len(to_send)
+    results["total"] = len(notification_objects)
+    return results
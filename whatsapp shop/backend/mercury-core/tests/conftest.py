@@ -0,0 +1,32 @@
+import importlib
+import pkgutil
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models as models_pkg
+from app.db.base import Base
+
+
+def setup_engine(shared=False):
+    """In-memory SQLite engine with every model's table created
+
+    shared=True keeps a single connection behind the pool, so several
+    sessions see the same database (e.g. two workers racing on a row).
+    """
+    if shared:
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine("sqlite:///:memory:")
+    # import all models to ensure mappers configured
+    for loader, name, ispkg in pkgutil.iter_modules(models_pkg.__path__):
+        importlib.import_module(f"app.models.{name}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def setup_db():
+    """Session on a fresh in-memory database"""
+    Session = sessionmaker(bind=setup_engine())
+    return Session()
@@ -0,0 +1,30 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.orm import raiseload
+
+
+@contextmanager
+def count_queries(db):
+    """Collect the SQL statements a session sends while the block runs
+
+    ORM selects issued inside the block also get raiseload("*"), so a lazy
+    relationship load raises instead of quietly adding a query per row.
+    """
+    engine = db.get_bind()
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def block_lazy_loads(state):
+        if state.is_select and not state.is_column_load and not state.is_relationship_load:
+            state.statement = state.statement.options(raiseload("*"))
+
+    event.listen(engine, "before_cursor_execute", record)
+    event.listen(db, "do_orm_execute", block_lazy_loads)
+    try:
+        yield statements
+    finally:
+        event.remove(db, "do_orm_execute", block_lazy_loads)
+        event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,82 @@
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionType
+from app.schemas.account import AccountUpdate
+from app.services.account import AccountService
+
+from tests.conftest import setup_db
+
+
+def test_trial_balance():
+    db = setup_db()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET)
+    sales = Account(code="4000", name="Sales Revenue", account_type=AccountType.INCOME)
+    unused = Account(code="6000", name="Operating Expenses", account_type=AccountType.EXPENSE)
+    db.add_all([cash, sales, unused])
+    db.commit()
+
+    db.add_all([
+        Transaction(journal_entry_id="JE-1", account_id=cash.id, transaction_type=TransactionType.DEBIT, amount=80),
+        Transaction(journal_entry_id="JE-1", account_id=sales.id, transaction_type=TransactionType.CREDIT, amount=80),
+        Transaction(journal_entry_id="JE-2", account_id=cash.id, transaction_type=TransactionType.CREDIT, amount=30),
+        Transaction(journal_entry_id="JE-2", account_id=sales.id, transaction_type=TransactionType.DEBIT, amount=30),
+    ])
+    db.commit()
+
+    result = AccountService.get_trial_balance(db)
+    balances = {a["account_code"]: a["balance"] for a in result["accounts"]}
+
+    assert balances == {"1000": 50, "4000": -50, "6000": 0}
+    assert result["total_debit"] == 50
+    assert result["total_credit"] == 50
+    assert result["balanced"]
+
+
+def test_update_account():
+    db = setup_db()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET)
+    bank = Account(code="1100", name="Bank", account_type=AccountType.ASSET)
+    db.add_all([cash, bank])
+    db.commit()
+
+    updated = AccountService.update_account(db, cash.id, AccountUpdate(name="Petty Cash", metadata={"x": 1}))
+    assert updated.name == "Petty Cash"
+    assert updated.code == "1000"
+
+    try:
+        AccountService.update_account(db, cash.id, AccountUpdate(code="1100"))
+        assert False, "duplicate code should be rejected"
+    except ValueError:
+        pass
+
+    try:
+        AccountService.update_account(db, 999, AccountUpdate(name="Missing"))
+        assert False, "missing account should be rejected"
+    except ValueError:
+        pass
+
+
+def test_get_accounts_keyset_pagination():
+    db = setup_db()
+
+    db.add_all([
+        Account(code=str(1000 + i), name=f"Account {i}", account_type=AccountType.ASSET)
+        for i in range(5)
+    ])
+    db.commit()
+
+    first = AccountService.get_accounts(db, limit=2)
+    second = AccountService.get_accounts(db, limit=2, cursor=first[-1].id)
+    third = AccountService.get_accounts(db, limit=2, cursor=second[-1].id)
+
+    codes = [a.code for a in first + second + third]
+    assert codes == ["1000", "1001", "1002", "1003", "1004"]
+    assert AccountService.get_accounts(db, limit=2, cursor=third[-1].id) == []
+
+
+if __name__ == "__main__":
+    test_trial_balance()
+    test_update_account()
+    test_get_accounts_keyset_pagination()
+    print("account service tests passed")
@@ -0,0 +1,149 @@
+from decimal import Decimal
+
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction
+from app.schemas._internal import TransactionLineItemDC
+from app.services.accounting import AccountingService
+
+from tests.conftest import setup_db
+
+
+def test_record_expense_posts_balanced_entry():
+    db = setup_db()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=100)
+    rent = Account(code="6000", name="Rent", account_type=AccountType.EXPENSE, balance=0)
+    db.add_all([cash, rent])
+    db.commit()
+
+    journal_entry_id = AccountingService.record_expense(db, 40, rent.id, cash.id, "Rent", "admin")
+
+    db.refresh(cash)
+    db.refresh(rent)
+    assert cash.balance == 60
+    assert rent.balance == 40
+    assert db.query(Transaction).filter(Transaction.journal_entry_id == journal_entry_id).count() == 2
+
+
+def test_journal_entry_with_repeated_account():
+    db = setup_db()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=0)
+    sales = Account(code="4000", name="Sales", account_type=AccountType.INCOME, balance=0)
+    db.add_all([cash, sales])
+    db.commit()
+
+    AccountingService.create_journal_entry(db, [
+        TransactionLineItemDC(account_id=cash.id, amount=30, is_debit=True),
+        TransactionLineItemDC(account_id=cash.id, amount=20, is_debit=True),
+        TransactionLineItemDC(account_id=sales.id, amount=50, is_debit=False),
+    ], "Two sales")
+
+    db.refresh(cash)
+    db.refresh(sales)
+    assert cash.balance == 50
+    assert sales.balance == 50
+
+
+def test_unbalanced_entry_rejected():
+    db = setup_db()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=0)
+    db.add(cash)
+    db.commit()
+
+    try:
+        AccountingService.create_journal_entry(
+            db, [TransactionLineItemDC(account_id=cash.id, amount=10, is_debit=True)], "Broken"
+        )
+        assert False, "unbalanced entry should be rejected"
+    except ValueError:
+        pass
+
+
+def test_journal_entry_unknown_account_rejected():
+    db = setup_db()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=0)
+    db.add(cash)
+    db.commit()
+
+    try:
+        AccountingService.create_journal_entry(db, [
+            TransactionLineItemDC(account_id=cash.id, amount=10, is_debit=True),
+            TransactionLineItemDC(account_id=999, amount=10, is_debit=False),
+        ], "Missing account")
+        assert False, "entry against an unknown account should be rejected"
+    except ValueError:
+        pass
+
+    db.refresh(cash)
+    assert cash.balance == 0
+    assert db.query(Transaction).count() == 0
+
+
+def test_trial_balance_totals():
+    db = setup_db()
+
+    db.add_all([
+        Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=70),
+        Account(code="4000", name="Sales", account_type=AccountType.INCOME, balance=100),
+        Account(code="6000", name="Rent", account_type=AccountType.EXPENSE, balance=30),
+        Account(code="6100", name="Unused", account_type=AccountType.EXPENSE, balance=0),
+    ])
+    db.commit()
+
+    result = AccountingService.get_trial_balance(db)
+
+    assert {a["code"] for a in result["accounts"]} == {"1000", "4000", "6000"}
+    assert result["total_debit"] == 100
+    assert result["total_credit"] == 100
+    assert result["balanced"]
+
+
+def test_trial_balance_is_exact_for_cents():
+    db = setup_db()
+
+    db.add_all([
+        Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=Decimal("0.10")),
+        Account(code="1100", name="Bank", account_type=AccountType.ASSET, balance=Decimal("0.20")),
+        Account(code="4000", name="Sales", account_type=AccountType.INCOME, balance=Decimal("0.30")),
+    ])
+    db.commit()
+
+    result = AccountingService.get_trial_balance(db)
+
+    assert result["total_debit"] == Decimal("0.30")
+    assert result["total_credit"] == Decimal("0.30")
+    assert result["balanced"]
+
+
+def test_record_sale_caches_revenue_account():
+    db = setup_db()
+    AccountingService.invalidate_caches()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=0)
+    sales = Account(code="4000", name="Sales", account_type=AccountType.INCOME, balance=0)
+    db.add_all([cash, sales])
+    db.commit()
+
+    AccountingService.record_sale(db, 25, cash.id, order_id=1, performed_by="admin")
+    assert AccountingService._get_revenue_account_id(db) == sales.id
+
+    # A cached id survives until the caches are invalidated
+    db.delete(sales)
+    db.commit()
+    assert AccountingService._get_revenue_account_id(db) == sales.id
+    AccountingService.invalidate_caches()
+    assert AccountingService._get_revenue_account_id(db) is None
+
+
+if __name__ == "__main__":
+    test_record_expense_posts_balanced_entry()
+    test_journal_entry_with_repeated_account()
+    test_unbalanced_entry_rejected()
+    test_journal_entry_unknown_account_rejected()
+    test_trial_balance_totals()
+    test_trial_balance_is_exact_for_cents()
+    test_record_sale_caches_revenue_account()
+    print("accounting service tests passed")
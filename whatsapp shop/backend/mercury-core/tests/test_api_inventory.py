@@ -1,24 +1,21 @@
+# Import anyio's backend here rather than on the TestClient's portal thread, where
+# pytest's assertion rewrite trips CPython 3.11.7's AST recursion check
+import anyio._backends._asyncio  # noqa: F401
 from fastapi import FastAPI, Depends
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-import pkgutil, importlib
-import app.models as models_pkg
-from app.db.base import Base
 from app.models.product import Product, ProductType
 from app.api.v1 import inventory as inventory_router_module
 
 from app.api.v1.inventory import router as inventory_router
 
+from tests.conftest import setup_engine
+
 
 def setup_app_and_db():
-    # setup in-memory DB
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
-    Session = sessionmaker(bind=engine)
-    # import all models first so metadata is registered
-    for loader, name, ispkg in pkgutil.iter_modules(models_pkg.__path__):
-        importlib.import_module(f"app.models.{name}")
-    Base.metadata.create_all(engine)
+    # One shared in-memory DB (the TestClient runs handlers on another thread),
+    # with expire_on_commit=False like the app's SessionLocal
+    Session = sessionmaker(bind=setup_engine(shared=True), expire_on_commit=False)
 
     db = Session()
 
@@ -67,7 +64,7 @@ def test_api_purchase_and_stock():
 
     # Sale 2 units
     resp = client.post("/inventory/movements/sale", json={"product_id": product.id, "quantity": 2})
-    assert resp.status_code == 200
+    assert resp.status_code == 201
     resp = client.get(f"/inventory/products/{product.id}/stock")
     assert resp.json()["stock_quantity"] == 3
 
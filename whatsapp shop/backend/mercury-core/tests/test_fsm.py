@@ -0,0 +1,34 @@
+from app.models.order import OrderStatus
+from app.models.booking import BookingStatus
+from app.fsm.order_states import ORDER_STATE_TRANSITIONS, can_transition, get_allowed_transitions
+from app.fsm.booking_states import BOOKING_STATE_TRANSITIONS, can_transition_booking
+
+
+def test_order_transitions_match_table():
+    for from_state in OrderStatus:
+        for to_state in OrderStatus:
+            expected = to_state in ORDER_STATE_TRANSITIONS.get(from_state, [])
+            assert can_transition(from_state, to_state) == expected
+
+    assert get_allowed_transitions(OrderStatus.DISPATCHED) == [OrderStatus.COMPLETED]
+
+
+def test_order_terminal_states_reject_everything():
+    for terminal in (OrderStatus.COMPLETED, OrderStatus.CANCELLED, OrderStatus.EXPIRED):
+        assert not any(can_transition(terminal, to_state) for to_state in OrderStatus)
+
+
+def test_booking_transitions_match_table():
+    for from_state in BookingStatus:
+        for to_state in BookingStatus:
+            expected = to_state in BOOKING_STATE_TRANSITIONS.get(from_state, [])
+            assert can_transition_booking(from_state, to_state) == expected
+
+    assert not can_transition_booking(BookingStatus.NO_SHOW, BookingStatus.CONFIRMED)
+
+
+if __name__ == "__main__":
+    test_order_transitions_match_table()
+    test_order_terminal_states_reject_everything()
+    test_booking_transitions_match_table()
+    print("fsm tests passed")
@@ -1,12 +1,15 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
 import pkgutil, importlib
 import app.models as models_pkg
 
 from app.db.base import Base
+from app.models.inventory import InventoryMovement, MovementType
 from app.models.product import Product, ProductType
 from app.services.inventory import InventoryService
+from app.utils.pagination import next_cursor
 
 
 def setup_db():
@@ -49,6 +52,118 @@ def test_inventory_flow():
         pass
 
 
+def test_record_movement_guards_stock():
+    db = setup_db()
+
+    p = Product(name="Widget", product_type=ProductType.PHYSICAL, selling_price=10.0, stock_quantity=0)
+    svc = Product(name="Haircut", product_type=ProductType.SERVICE, selling_price=15.0)
+    db.add_all([p, svc])
+    db.commit()
+
+    InventoryService.record_movement(db, p.id, MovementType.INBOUND, 5, performed_by="tester")
+    InventoryService.record_movement(db, p.id, MovementType.OUTBOUND, 2, performed_by="tester")
+    assert p.stock_quantity == 3
+
+    for product_id, movement_type in [(p.id, MovementType.OUTBOUND), (svc.id, MovementType.INBOUND), (999, MovementType.INBOUND)]:
+        try:
+            InventoryService.record_movement(db, product_id, movement_type, 4, performed_by="tester")
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+
+    assert InventoryService.get_current_stock(db, p.id) == 3
+    assert db.query(InventoryMovement).count() == 2
+
+
+def test_record_movements_bulk():
+    db = setup_db()
+
+    soap = Product(name="Soap", product_type=ProductType.PHYSICAL, selling_price=2.0, stock_quantity=5)
+    oil = Product(name="Oil", product_type=ProductType.PHYSICAL, selling_price=7.0, stock_quantity=0)
+    db.add_all([soap, oil])
+    db.commit()
+
+    count = InventoryService.record_movements_bulk(db, [
+        {"product_id": soap.id, "movement_type": MovementType.INBOUND, "quantity": 10},
+        {"product_id": soap.id, "movement_type": MovementType.OUTBOUND, "quantity": 4},
+        {"product_id": oil.id, "movement_type": "inbound", "quantity": 3, "unit_cost": 5.0},
+    ], performed_by="tester")
+
+    assert count == 3
+    assert InventoryService.get_current_stock(db, soap.id) == 11
+    assert InventoryService.get_current_stock(db, oil.id) == 3
+    assert db.query(InventoryMovement).count() == 3
+
+    # A batch that would oversell is rejected as a whole
+    try:
+        InventoryService.record_movements_bulk(db, [
+            {"product_id": oil.id, "movement_type": MovementType.OUTBOUND, "quantity": 4},
+        ], performed_by="tester")
+        assert False, "Expected ValueError for insufficient stock"
+    except ValueError:
+        pass
+    assert db.query(InventoryMovement).count() == 3
+
+    # NULL stock counts as zero instead of breaking the check or nulling the UPDATE
+    legacy = Product(name="Legacy", product_type=ProductType.PHYSICAL, selling_price=1.0)
+    db.add(legacy)
+    db.commit()
+    db.execute(update(Product).where(Product.id == legacy.id).values(stock_quantity=None))
+    db.commit()
+    InventoryService.record_movements_bulk(db, [
+        {"product_id": legacy.id, "movement_type": MovementType.INBOUND, "quantity": 2},
+    ], performed_by="tester")
+    assert InventoryService.get_current_stock(db, legacy.id) == 2
+
+
+def test_stock_constraint_rejects_negative_stock():
+    db = setup_db()
+
+    soap = Product(name="Soap", product_type=ProductType.PHYSICAL, selling_price=2.0, stock_quantity=1)
+    db.add(soap)
+    db.commit()
+
+    try:
+        db.execute(update(Product).where(Product.id == soap.id).values(stock_quantity=Product.stock_quantity - 2))
+        db.commit()
+        assert False, "Expected IntegrityError for negative stock"
+    except IntegrityError:
+        db.rollback()
+
+    assert InventoryService.get_current_stock(db, soap.id) == 1
+
+
+def test_product_movements_keyset_pages():
+    db = setup_db()
+
+    soap = Product(name="Soap", product_type=ProductType.PHYSICAL, selling_price=2.0, stock_quantity=0)
+    db.add(soap)
+    db.commit()
+
+    # Five movements, two of them sharing a timestamp so the id tie-break matters
+    stamps = [datetime(2024, 1, d) for d in (1, 2, 3, 3, 4)]
+    db.add_all([
+        InventoryMovement(product_id=soap.id, movement_type=MovementType.INBOUND, quantity=i + 1, created_at=stamp)
+        for i, stamp in enumerate(stamps)
+    ])
+    db.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        page = InventoryService.get_product_movements(db, soap.id, cursor=cursor, limit=2)
+        if not page:
+            break
+        seen.extend(m.quantity for m in page)
+        cursor = next_cursor(page)
+
+    assert seen == [5, 4, 3, 2, 1]
+
+
 if __name__ == "__main__":
     test_inventory_flow()
+    test_record_movement_guards_stock()
+    test_record_movements_bulk()
+    test_stock_constraint_rejects_negative_stock()
+    test_product_movements_keyset_pages()
     print("inventory service tests passed")
@@ -0,0 +1,168 @@
+import asyncio
+from contextlib import contextmanager
+from decimal import Decimal
+
+from app.tasks import notifications
+from app.tasks.notifications import (
+    Notification, NotificationStatus, NotificationTemplate, NotificationType,
+    notification_service, send_bulk_notifications,
+)
+
+
+@contextmanager
+def fake_providers(outcomes=None):
+    """Swap every provider for one that records each call's recipients; outcomes are popped per call"""
+    calls = []
+
+    async def send(notification):
+        calls.append(list(notification.recipient))
+        return outcomes.pop(0) if outcomes else True
+
+    original = notification_service._providers
+    notification_service._providers = (send,) * len(original)
+    notifications._recent_sends.clear()
+    try:
+        yield calls
+    finally:
+        notification_service._providers = original
+        notifications._recent_sends.clear()
+
+
+def email(recipient, name="A"):
+    return {"recipient": recipient, "template": "order_confirmation", "context": {"customer_name": name},
+            "notification_type": "email"}
+
+
+def push(token, title="Shipped"):
+    return Notification(recipient=token, template=NotificationTemplate.ORDER_SHIPPED, context={"title": title},
+                        notification_type=NotificationType.PUSH)
+
+
+def test_push_notifications_batch_per_payload():
+    same = [push("tok1"), push("tok2"), push("tok3")]
+    other = push("tok4", title="Delivered")
+    mail = Notification(recipient="a@x.com", template=NotificationTemplate.ORDER_SHIPPED,
+                        context={"title": "Shipped"})
+
+    groups = notification_service._group_for_batching([same[0], mail, same[1], other, same[2]])
+    assert groups == [same, [mail], [other]]
+
+    # A group is closed once it would go over the provider's recipient limit
+    original = notifications.PROVIDER_BATCH_LIMITS
+    notifications.PROVIDER_BATCH_LIMITS = {NotificationType.PUSH: 2}
+    try:
+        assert notification_service._group_for_batching(same) == [same[:2], same[2:]]
+    finally:
+        notifications.PROVIDER_BATCH_LIMITS = original
+
+
+def test_send_multiple_reports_each_notification():
+    pushes = [push("tok1"), push("tok2")]
+    mails = [Notification(recipient=r, template=NotificationTemplate.ORDER_SHIPPED, context={})
+             for r in ("a@x.com", "b@x.com")]
+
+    # One call per group, in first-seen order: the push batch, then each email
+    with fake_providers(outcomes=[True, False, True]) as calls:
+        results = asyncio.run(notification_service.send_multiple([pushes[0], mails[0], pushes[1], mails[1]]))
+
+    assert calls == [["tok1", "tok2"], ["a@x.com"], ["b@x.com"]]
+    assert results == {"total": 4, "sent": 3, "failed": 1}
+    assert [n.status for n in pushes] == [NotificationStatus.SENT, NotificationStatus.SENT]
+    assert pushes[0].sent_at is not None and pushes[0].sent_at == pushes[1].sent_at
+    assert [n.status for n in mails] == [NotificationStatus.FAILED, NotificationStatus.SENT]
+
+
+def test_send_multiple_caps_concurrency():
+    in_flight = {"now": 0, "peak": 0}
+
+    async def slow_send(notification):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.001)
+        in_flight["now"] -= 1
+        return True
+
+    mails = [Notification(recipient=f"{i}@x.com", template=NotificationTemplate.ORDER_SHIPPED, context={})
+             for i in range(10)]
+    original = notification_service._providers
+    notification_service._providers = (slow_send,) * len(original)
+    try:
+        results = asyncio.run(notification_service.send_multiple(mails, max_concurrency=3))
+    finally:
+        notification_service._providers = original
+
+    assert results == {"total": 10, "sent": 10, "failed": 0}
+    assert in_flight["peak"] == 3
+
+
+def test_render_template_tolerates_missing_amounts():
+    text = notification_service._render_template("order_confirmation", {"customer_name": "A"})
+    assert "Hello A," in text
+    assert "*Total:* \n" in text
+
+    text = notification_service._render_template(NotificationTemplate.ORDER_CONFIRMATION, {
+        "customer_name": "A", "subtotal": Decimal("1234.5"), "shipping_cost": None, "total": "TBD",
+    })
+    assert "*Subtotal:* $1,234.50" in text
+    assert "*Shipping:* \n" in text
+    assert "*Total:* TBD" in text
+
+
+def test_bulk_skips_duplicates_in_batch():
+    with fake_providers() as calls:
+        results = asyncio.run(send_bulk_notifications([email("a@x.com"), email("a@x.com"), email("b@x.com")]))
+
+    assert calls == [["a@x.com"], ["b@x.com"]]
+    assert results == {"total": 3, "sent": 2, "failed": 0, "deduplicated": 1}
+
+
+def test_bulk_skips_repeats_within_ttl():
+    with fake_providers() as calls:
+        asyncio.run(send_bulk_notifications([email("a@x.com")]))
+        repeat = asyncio.run(send_bulk_notifications([email("a@x.com"), email("a@x.com", name="B")]))
+        assert repeat["deduplicated"] == 1
+        assert calls == [["a@x.com"], ["a@x.com"]]
+
+        # Once the entry expires the same message goes out again
+        for key in notifications._recent_sends:
+            notifications._recent_sends[key] = 0
+        assert asyncio.run(send_bulk_notifications([email("a@x.com")]))["sent"] == 1
+        assert len(calls) == 3
+
+
+def test_bulk_retries_after_failed_send():
+    with fake_providers(outcomes=[False, True]) as calls:
+        first = asyncio.run(send_bulk_notifications([email("a@x.com")]))
+        retry = asyncio.run(send_bulk_notifications([email("a@x.com")]))
+
+    assert first["failed"] == 1
+    assert retry == {"total": 1, "sent": 1, "failed": 0, "deduplicated": 0}
+    assert len(calls) == 2
+
+
+def test_dedupe_cache_evicts_oldest():
+    original = notifications.DEDUPE_MAX_KEYS
+    notifications.DEDUPE_MAX_KEYS = 2
+    try:
+        with fake_providers() as calls:
+            asyncio.run(send_bulk_notifications([email("a@x.com"), email("b@x.com"), email("c@x.com")]))
+            assert len(notifications._recent_sends) == 2
+
+            # a@x.com was evicted, so only it is sent again
+            results = asyncio.run(send_bulk_notifications([email(r) for r in ("a@x.com", "b@x.com", "c@x.com")]))
+            assert results["sent"] == 1 and results["deduplicated"] == 2
+            assert calls[-1] == ["a@x.com"]
+    finally:
+        notifications.DEDUPE_MAX_KEYS = original
+
+
+if __name__ == "__main__":
+    test_render_template_tolerates_missing_amounts()
+    test_push_notifications_batch_per_payload()
+    test_send_multiple_reports_each_notification()
+    test_send_multiple_caps_concurrency()
+    test_bulk_skips_duplicates_in_batch()
+    test_bulk_skips_repeats_within_ttl()
+    test_bulk_retries_after_failed_send()
+    test_dedupe_cache_evicts_oldest()
+    print("notification tests passed")
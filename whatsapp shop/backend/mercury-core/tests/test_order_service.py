@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import sessionmaker
+
+from app.models.inventory import InventoryMovement
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.product import Product, ProductType
+from app.models.state_transition import OrderStateTransition
+from app.services.order import OrderService, OrderConflictError
+from app.services import order_service
+
+from tests.conftest import setup_engine, setup_db
+
+
+def test_create_order_and_item_subtotals():
+    db = setup_db()
+
+    soap = Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL, selling_price=Decimal("2.50"))
+    oil = Product(name="Oil", sku="OIL", product_type=ProductType.PHYSICAL, selling_price=Decimal("7.00"))
+    db.add_all([soap, oil])
+    db.commit()
+
+    order = OrderService.create_order(db, customer_id=1, items=[
+        {"product_id": soap.id, "quantity": 4},
+        {"product_id": oil.id, "quantity": 1},
+    ])
+
+    assert order.subtotal == Decimal("17.00")
+    assert order.order_number.startswith("ORD-")
+
+    subtotals = db.query(OrderItem.subtotal).filter(OrderItem.order_id == order.id).all()
+    assert sorted(s for s, in subtotals) == [Decimal("7.00"), Decimal("10.00")]
+
+
+def test_create_order_unknown_product():
+    db = setup_db()
+
+    soap = Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL, selling_price=Decimal("2.50"))
+    db.add(soap)
+    db.commit()
+
+    try:
+        OrderService.create_order(db, customer_id=1, items=[
+            {"product_id": soap.id, "quantity": 1},
+            {"product_id": 999, "quantity": 1},
+        ])
+        assert False, "Expected ValueError for unknown product"
+    except ValueError:
+        pass
+
+
+def test_expire_old_orders():
+    db = setup_db()
+
+    soap = Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL, selling_price=Decimal("2.50"))
+    db.add(soap)
+    db.commit()
+
+    stale = OrderService.create_order(db, customer_id=1, items=[{"product_id": soap.id, "quantity": 1}])
+    fresh = OrderService.create_order(db, customer_id=1, items=[{"product_id": soap.id, "quantity": 1}])
+    stale.expires_at = datetime.utcnow() - timedelta(hours=1)
+    db.commit()
+
+    assert OrderService.expire_old_orders(db) == 1
+    assert db.get(Order, stale.id).status == OrderStatus.EXPIRED
+    assert db.get(Order, fresh.id).status == OrderStatus.PENDING_PAYMENT
+
+    transition = db.query(OrderStateTransition).one()
+    assert transition.order_id == stale.id
+    assert transition.to_state == OrderStatus.EXPIRED.value
+
+    assert OrderService.expire_old_orders(db) == 0
+
+
+def test_expire_old_orders_in_batches():
+    db = setup_db()
+
+    soap = Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL, selling_price=Decimal("2.50"))
+    db.add(soap)
+    db.commit()
+
+    orders = [
+        OrderService.create_order(db, customer_id=1, items=[{"product_id": soap.id, "quantity": 1}])
+        for _ in range(5)
+    ]
+    for order in orders:
+        order.expires_at = datetime.utcnow() - timedelta(hours=1)
+    # Submitted payments are awaiting review and must not expire
+    orders[0].status = OrderStatus.PAYMENT_SUBMITTED
+    db.commit()
+
+    assert OrderService.expire_old_orders(db, batch_size=2) == 4
+    assert db.query(Order).filter(Order.status == OrderStatus.EXPIRED).count() == 4
+    assert db.get(Order, orders[0].id).status == OrderStatus.PAYMENT_SUBMITTED
+    from_states = {t.order_id: t.from_state for t in db.query(OrderStateTransition)}
+    assert set(from_states) == {order.id for order in orders[1:]}
+    assert set(from_states.values()) == {OrderStatus.PENDING_PAYMENT.value}
+
+
+def test_concurrent_transition_conflicts():
+    # Two sessions sharing one in-memory database, like two workers
+    Session = sessionmaker(bind=setup_engine(shared=True), expire_on_commit=False)
+    first, second = Session(), Session()
+
+    soap = Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL, selling_price=Decimal("2.50"))
+    first.add(soap)
+    first.commit()
+    order = OrderService.create_order(first, customer_id=1, items=[{"product_id": soap.id, "quantity": 1}])
+    assert order.version_id == 1
+
+    # The second worker loads the order, then the first one moves it on
+    stale = second.get(Order, order.id)
+    OrderService.transition_order_state(first, order.id, OrderStatus.PAYMENT_SUBMITTED, "worker-1")
+    assert order.version_id == 2
+    assert stale.version_id == 1
+
+    try:
+        OrderService.transition_order_state(second, order.id, OrderStatus.CANCELLED, "worker-2")
+        assert False, "Expected OrderConflictError for a stale order"
+    except OrderConflictError:
+        pass
+
+    second.expire_all()
+    assert second.get(Order, order.id).status == OrderStatus.PAYMENT_SUBMITTED
+
+
+def test_cancellation_restocks_items_in_one_batch():
+    db = setup_db()
+
+    soap = Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL,
+                   selling_price=Decimal("2.50"), stock_quantity=5)
+    ebook = Product(name="Ebook", sku="EBOOK", product_type=ProductType.DIGITAL, selling_price=Decimal("9.00"))
+    db.add_all([soap, ebook])
+    db.commit()
+
+    order = Order(order_number="ORD-1", customer_id=1, status=OrderStatus.CANCELLED,
+                  subtotal=Decimal("14.00"), total_amount=Decimal("14.00"))
+    db.add(order)
+    db.commit()
+    db.add_all([
+        OrderItem(order_id=order.id, product_id=soap.id, product_name="Soap", quantity=1,
+                  unit_price=Decimal("2.50"), subtotal=Decimal("2.50")),
+        OrderItem(order_id=order.id, product_id=soap.id, product_name="Soap", quantity=1,
+                  unit_price=Decimal("2.50"), subtotal=Decimal("2.50")),
+        OrderItem(order_id=order.id, product_id=ebook.id, product_name="Ebook", quantity=1,
+                  unit_price=Decimal("9.00"), subtotal=Decimal("9.00")),
+    ])
+    db.commit()
+
+    assert soap.stock_quantity == 5
+    order_service.OrderService(db)._handle_order_cancellation(order, "admin")
+    # The loaded product sees the SQL-side restock without a refresh
+    assert soap.stock_quantity == 7
+    db.commit()
+
+    movements = db.query(InventoryMovement).all()
+    assert [(m.product_id, m.quantity) for m in movements] == [(soap.id, 1), (soap.id, 1)]
+
+
+def test_count_orders_applies_filters():
+    db = setup_db()
+
+    db.add_all([
+        Order(order_number="ORD-1", customer_id=1, status=OrderStatus.PENDING_PAYMENT,
+              subtotal=Decimal("1.00"), total_amount=Decimal("1.00")),
+        Order(order_number="ORD-2", customer_id=1, status=OrderStatus.COMPLETED,
+              subtotal=Decimal("1.00"), total_amount=Decimal("1.00")),
+        Order(order_number="ORD-3", customer_id=2, status=OrderStatus.PENDING_PAYMENT,
+              subtotal=Decimal("1.00"), total_amount=Decimal("1.00")),
+    ])
+    db.commit()
+
+    service = order_service.OrderService(db)
+    assert service.count_orders() == 3
+    assert service.count_orders(customer_id=1) == 2
+    assert service.count_orders(status=OrderStatus.PENDING_PAYMENT, customer_id=1) == 1
+
+
+if __name__ == "__main__":
+    test_create_order_and_item_subtotals()
+    test_create_order_unknown_product()
+    test_expire_old_orders()
+    test_expire_old_orders_in_batches()
+    test_concurrent_transition_conflicts()
+    test_cancellation_restocks_items_in_one_batch()
+    test_count_orders_applies_filters()
+    print("order service tests passed")
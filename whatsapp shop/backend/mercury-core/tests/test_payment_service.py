@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+from app.models.payment import Payment, PaymentMethod, PaymentStatus
+from app.schemas.payment import PaymentUpdate
+from app.services.payment import PaymentService
+
+from tests.conftest import setup_db
+from tests.query_counter import count_queries
+
+
+def test_payment_stats():
+    db = setup_db()
+
+    db.add_all([
+        Payment(order_id=1, amount=Decimal("10.00"), payment_method=PaymentMethod.CASH,
+                payment_reference="PAY-1", status=PaymentStatus.VERIFIED),
+        Payment(order_id=1, amount=Decimal("20.00"), payment_method=PaymentMethod.CASH,
+                payment_reference="PAY-2", status=PaymentStatus.VERIFIED),
+        Payment(order_id=2, amount=Decimal("30.00"), payment_method=PaymentMethod.CARD,
+                payment_reference="PAY-3", status=PaymentStatus.PENDING),
+    ])
+    db.commit()
+
+    stats = PaymentService.get_payment_stats(db)
+
+    assert stats["total_payments"] == 3
+    assert stats["total_amount"] == 60.0
+    assert stats["avg_amount"] == 20.0
+    assert stats["status_breakdown"] == {"pending": 1, "submitted": 0, "verified": 2, "rejected": 0}
+
+
+def test_update_payment_stamps_verification_once():
+    db = setup_db()
+    db.expire_on_commit = False  # like the app's SessionLocal
+
+    payment = Payment(order_id=1, amount=Decimal("10.00"), payment_method=PaymentMethod.CASH,
+                      payment_reference="PAY-1", status=PaymentStatus.SUBMITTED)
+    db.add(payment)
+    db.commit()
+
+    # A single UPDATE ... RETURNING, no lookup before or after
+    with count_queries(db) as queries:
+        updated = PaymentService.update_payment(db, payment.id, PaymentUpdate(status="verified", notes="seen"))
+    assert len(queries) == 1
+    assert updated.status == PaymentStatus.VERIFIED
+    assert updated.notes == "seen"
+    verified_at = updated.verified_at
+    assert verified_at is not None
+
+    # Verifying again keeps the original timestamp
+    again = PaymentService.update_payment(db, payment.id, PaymentUpdate(status="verified"))
+    assert again.verified_at == verified_at
+
+    try:
+        PaymentService.update_payment(db, 999, PaymentUpdate(notes="missing"))
+        assert False, "Expected ValueError for unknown payment"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_payment_stats()
+    test_update_payment_stamps_verification_once()
+    print("payment service tests passed")
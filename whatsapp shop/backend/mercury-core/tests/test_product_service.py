@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+from app.models.product import Product, ProductType
+from app.services.product import ProductService
+
+from tests.conftest import setup_db
+
+
+def test_update_product():
+    db = setup_db()
+
+    soap = Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL, selling_price=Decimal("2.50"))
+    db.add(soap)
+    db.commit()
+
+    updated = ProductService.update_product(
+        db, soap.id, name="Lavender Soap", selling_price=Decimal("3.00"), description=None, bogus="ignored"
+    )
+    assert updated.name == "Lavender Soap"
+    assert updated.selling_price == Decimal("3.00")
+
+    assert ProductService.update_product_fields(db, soap.id, name="Soap") is True
+    assert db.get(Product, soap.id).name == "Soap"
+
+    assert ProductService.update_product(db, 999, name="Missing") is None
+    assert ProductService.update_product_fields(db, 999, name="Missing") is False
+
+
+def test_get_low_stock_products():
+    db = setup_db()
+
+    db.add_all([
+        Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL, selling_price=Decimal("2.50"),
+                stock_quantity=2, reorder_level=5),
+        Product(name="Oil", sku="OIL", product_type=ProductType.PHYSICAL, selling_price=Decimal("7.00"),
+                stock_quantity=8, reorder_level=5),
+        Product(name="Ebook", sku="EBOOK", product_type=ProductType.DIGITAL, selling_price=Decimal("9.00"),
+                stock_quantity=0, reorder_level=5),
+        # No reorder level set: never reported as low stock
+        Product(name="Brush", sku="BRUSH", product_type=ProductType.PHYSICAL, selling_price=Decimal("3.00"),
+                stock_quantity=0),
+    ])
+    db.commit()
+
+    rows = ProductService.get_low_stock_rows(db)
+    assert [dict(row) for row in rows] == [
+        {"id": 1, "name": "Soap", "stock_quantity": 2, "reorder_level": 5}
+    ]
+    assert {row["name"] for row in ProductService.get_low_stock_rows(db, threshold=10)} == {"Soap", "Oil", "Brush"}
+
+    products = ProductService.get_low_stock_products(db)
+    assert [p.sku for p in products] == ["SOAP"]
+
+
+if __name__ == "__main__":
+    test_update_product()
+    test_get_low_stock_products()
+    print("product service tests passed")
@@ -0,0 +1,243 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import update
+
+from app.models.account import Account, AccountType
+from app.models.order import Order
+from app.models.payment import Payment, PaymentMethod, PaymentStatus
+from app.models.product import Product, ProductType
+from app.models.transaction import Transaction, TransactionType
+from app.services.accounting import AccountingService
+from app.services.report import ReportService
+
+from tests.conftest import setup_db
+from tests.query_counter import count_queries
+
+
+def test_sales_report_buckets():
+    db = setup_db()
+
+    def order(number, when, total):
+        return Order(order_number=number, customer_id=1, subtotal=Decimal(total),
+                     total_amount=Decimal(total), created_at=when)
+
+    db.add_all([
+        order("ORD-1", datetime(2024, 1, 1, 9), "10.00"),   # Monday
+        order("ORD-2", datetime(2024, 1, 1, 17), "5.00"),
+        order("ORD-3", datetime(2024, 1, 7, 12), "20.00"),  # Sunday, same week
+        order("ORD-4", datetime(2024, 2, 2, 12), "1.00"),
+    ])
+    db.commit()
+
+    start, end = datetime(2024, 1, 1), datetime(2024, 3, 1)
+
+    with count_queries(db) as queries:
+        by_day = ReportService.get_sales_report(db, start, end, "day")
+    assert len(queries) == 1
+    assert by_day["data"]["2024-01-01"] == {"orders": 2, "revenue": Decimal("15.00")}
+    assert by_day["summary"]["total_orders"] == 4
+    assert by_day["summary"]["total_revenue"] == Decimal("36.00")
+
+    by_week = ReportService.get_sales_report(db, start, end, "week")
+    assert by_week["data"]["2024-01-01"]["orders"] == 3
+    assert by_week["data"]["2024-01-29"]["orders"] == 1
+
+    by_month = ReportService.get_sales_report(db, start, end, "month")
+    assert set(by_month["data"]) == {"2024-01", "2024-02"}
+
+    overall = ReportService.get_sales_report(db, start, end, "total")
+    assert overall["data"] == {"total": {"orders": 4, "revenue": Decimal("36.00")}}
+
+
+def test_payment_report_groups():
+    db = setup_db()
+
+    def payment(ref, method, status, amount):
+        return Payment(order_id=1, amount=Decimal(amount), payment_method=method, payment_reference=ref,
+                       status=status, created_at=datetime(2024, 1, 5))
+
+    db.add_all([
+        payment("PAY-1", PaymentMethod.CASH, PaymentStatus.VERIFIED, "10.00"),
+        payment("PAY-2", PaymentMethod.CASH, PaymentStatus.PENDING, "5.00"),
+        payment("PAY-3", PaymentMethod.CARD, PaymentStatus.VERIFIED, "20.00"),
+    ])
+    db.commit()
+
+    with count_queries(db) as queries:
+        report = ReportService.get_payment_report(db, datetime(2024, 1, 1), datetime(2024, 1, 31))
+    assert len(queries) == 2
+
+    assert report["summary"] == {"total_payments": 3, "total_amount": Decimal("35.00")}
+    assert report["by_method"]["cash"] == {"count": 2, "amount": Decimal("15.00")}
+    assert report["by_status"] == {"verified": 2, "pending": 1}
+
+    # A payment without a status is reported as unknown
+    db.execute(update(Payment).where(Payment.payment_reference == "PAY-2").values(status=None))
+    report = ReportService.get_payment_report(db, datetime(2024, 1, 1), datetime(2024, 1, 31))
+    assert report["by_status"] == {"verified": 2, "unknown": 1}
+
+
+def test_inventory_report():
+    db = setup_db()
+
+    db.add_all([
+        Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL, category="Bath",
+                selling_price=Decimal("2.00"), stock_quantity=10, reorder_level=5),
+        Product(name="Sponge", sku="SPONGE", product_type=ProductType.PHYSICAL, category="Bath",
+                selling_price=Decimal("1.50"), stock_quantity=2, reorder_level=5),
+        Product(name="Ebook", sku="EBOOK", product_type=ProductType.DIGITAL,
+                selling_price=Decimal("9.00"), stock_quantity=0),
+    ])
+    db.commit()
+
+    with count_queries(db) as queries:
+        report = ReportService.get_inventory_report(db)
+    assert len(queries) == 1
+
+    assert report["summary"] == {
+        "total_products": 3,
+        "in_stock": 2,
+        "out_of_stock": 1,
+        "low_stock": 1,
+        "total_value": Decimal("23.00"),
+    }
+    assert report["by_category"]["Bath"] == {"count": 2, "value": Decimal("23.00"), "quantity": 12}
+    assert report["by_category"]["Uncategorized"]["count"] == 1
+
+
+def test_dashboard_metrics():
+    db = setup_db()
+
+    now = datetime.utcnow()
+    db.add_all([
+        Order(order_number="ORD-1", customer_id=1, subtotal=Decimal("10.00"), total_amount=Decimal("10.00"),
+              created_at=now),
+        Order(order_number="ORD-2", customer_id=1, subtotal=Decimal("5.00"), total_amount=Decimal("5.00"),
+              created_at=datetime(2000, 1, 1)),
+        Payment(order_id=1, amount=Decimal("10.00"), payment_method=PaymentMethod.CASH,
+                payment_reference="PAY-1", status=PaymentStatus.PENDING),
+        Product(name="Soap", sku="SOAP", product_type=ProductType.PHYSICAL,
+                selling_price=Decimal("2.00"), stock_quantity=1, reorder_level=5),
+        Product(name="Brush", sku="BRUSH", product_type=ProductType.PHYSICAL,
+                selling_price=Decimal("3.00"), stock_quantity=0),
+    ])
+    db.commit()
+
+    with count_queries(db) as queries:
+        metrics = ReportService.get_dashboard_metrics(db)
+    assert len(queries) == 1
+
+    assert metrics["today"] == {"orders": 1, "revenue": 10.0}
+    assert metrics["month"] == {"orders": 1, "revenue": 10.0}
+    assert metrics["pending_payments"] == 1
+    assert metrics["low_stock_alerts"] == 1
+
+
+def test_profit_loss_report():
+    db = setup_db()
+    AccountingService.invalidate_caches()
+
+    sales = Account(code="4000", name="Sales", account_type=AccountType.INCOME, balance=0)
+    services = Account(code="4100", name="Services", account_type=AccountType.INCOME, balance=0)
+    rent = Account(code="6000", name="Rent", account_type=AccountType.EXPENSE, balance=0)
+    db.add_all([sales, services, rent])
+    db.commit()
+
+    def tx(account, tx_type, amount, day):
+        return Transaction(journal_entry_id="JE-1", account_id=account.id, transaction_type=tx_type,
+                           amount=Decimal(amount), transaction_date=datetime(2024, 1, day))
+
+    db.add_all([
+        tx(sales, TransactionType.CREDIT, "100.00", 5),
+        tx(sales, TransactionType.CREDIT, "50.00", 6),
+        tx(sales, TransactionType.DEBIT, "10.00", 7),     # wrong side, ignored
+        tx(sales, TransactionType.CREDIT, "999.00", 28),  # outside the period
+        tx(rent, TransactionType.DEBIT, "40.00", 10),
+    ])
+    db.commit()
+
+    # Cold: two account lists and one aggregate; warm: just the aggregate
+    with count_queries(db) as queries:
+        report = ReportService.get_profit_loss_report(db, datetime(2024, 1, 1), datetime(2024, 1, 20))
+    assert len(queries) == 3
+    with count_queries(db) as queries:
+        ReportService.get_profit_loss_report(db, datetime(2024, 1, 1), datetime(2024, 1, 20))
+    assert len(queries) == 1
+
+    assert report["revenue"] == Decimal("150.00")
+    assert report["expenses"] == Decimal("40.00")
+    assert report["net_profit"] == Decimal("110.00")
+    # Accounts without activity are still listed
+    assert {a["code"] for a in report["revenue_accounts"]} == {"4000", "4100"}
+
+
+def test_balance_sheet_report():
+    db = setup_db()
+    AccountingService.invalidate_caches()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=0)
+    bank = Account(code="1100", name="Bank", account_type=AccountType.ASSET, balance=0)
+    loan = Account(code="2000", name="Loan", account_type=AccountType.LIABILITY, balance=0)
+    capital = Account(code="3000", name="Capital", account_type=AccountType.EQUITY, balance=0)
+    db.add_all([cash, bank, loan, capital])
+    db.commit()
+
+    def tx(account, tx_type, amount, day):
+        return Transaction(journal_entry_id="JE-1", account_id=account.id, transaction_type=tx_type,
+                           amount=Decimal(amount), transaction_date=datetime(2024, 1, day))
+
+    db.add_all([
+        tx(cash, TransactionType.DEBIT, "100.00", 1),
+        tx(capital, TransactionType.CREDIT, "100.00", 1),
+        tx(cash, TransactionType.DEBIT, "50.00", 2),
+        tx(loan, TransactionType.CREDIT, "50.00", 2),
+        tx(cash, TransactionType.CREDIT, "20.00", 3),
+        tx(loan, TransactionType.DEBIT, "20.00", 3),
+        tx(cash, TransactionType.DEBIT, "500.00", 30),  # after the report date
+    ])
+    db.commit()
+
+    # Cold: three account lists and one aggregate; warm: just the aggregate
+    with count_queries(db) as queries:
+        report = ReportService.get_balance_sheet_report(db, datetime(2024, 1, 10))
+    assert len(queries) == 4
+    with count_queries(db) as queries:
+        ReportService.get_balance_sheet_report(db, datetime(2024, 1, 10))
+    assert len(queries) == 1
+
+    assert report["assets"]["total"] == Decimal("130.00")
+    assert {a["code"]: a["balance"] for a in report["assets"]["accounts"]} == {"1000": Decimal("130.00"), "1100": 0}
+    assert report["liabilities"]["total"] == Decimal("30.00")
+    assert report["equity"]["total"] == Decimal("100.00")
+    assert report["total_liabilities_equity"] == report["assets"]["total"]
+
+
+def test_report_account_lists_are_cached():
+    db = setup_db()
+    AccountingService.invalidate_caches()
+
+    db.add(Account(code="4000", name="Sales", account_type=AccountType.INCOME, balance=0))
+    db.commit()
+    start, end = datetime(2024, 1, 1), datetime(2024, 1, 31)
+    assert [a["code"] for a in ReportService.get_profit_loss_report(db, start, end)["revenue_accounts"]] == ["4000"]
+
+    # Added behind AccountService's back: the cached list is used until invalidated
+    db.add(Account(code="4100", name="Services", account_type=AccountType.INCOME, balance=0))
+    db.commit()
+    assert [a["code"] for a in ReportService.get_profit_loss_report(db, start, end)["revenue_accounts"]] == ["4000"]
+    AccountingService.invalidate_caches()
+    assert [a["code"] for a in ReportService.get_profit_loss_report(db, start, end)["revenue_accounts"]] == [
+        "4000", "4100"
+    ]
+
+
+if __name__ == "__main__":
+    test_sales_report_buckets()
+    test_payment_report_groups()
+    test_inventory_report()
+    test_dashboard_metrics()
+    test_profit_loss_report()
+    test_balance_sheet_report()
+    test_report_account_lists_are_cached()
+    print("report service tests passed")
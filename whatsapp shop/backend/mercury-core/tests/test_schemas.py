@@ -0,0 +1,108 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.schemas.order import OrderResponse, OrderItemResponse
+from app.schemas.booking import BOOKING_LIST_ADAPTER
+from app.schemas.document import DocumentUpdate
+from app.schemas._stream import iter_json_list
+from app.schemas.transaction import Transaction, TransactionLineItem
+from app.schemas.payment import Payment
+
+
+def test_order_response_from_attributes():
+    now = datetime.utcnow()
+    item = SimpleNamespace(id=1, product_id=7, product_name="Soap", quantity=2,
+                           unit_price=Decimal("1.50"), subtotal=Decimal("3.00"))
+    order = SimpleNamespace(id=1, order_number="ORD-1", customer_id=3, status="pending_payment",
+                            source="web", subtotal=Decimal("3.00"), total_amount=Decimal("3.00"),
+                            payment_reference=None, delivery_address=None, expires_at=None,
+                            created_at=now, items=[item])
+
+    response = OrderResponse.model_validate(order)
+
+    assert response.order_number == "ORD-1"
+    assert isinstance(response.items[0], OrderItemResponse)
+    assert response.items[0].subtotal == Decimal("3.00")
+
+
+def test_transaction_validates_dicts():
+    now = datetime.utcnow()
+    row = {
+        "id": 1, "transaction_type": "payment", "created_at": now, "updated_at": now,
+        "total_amount": 10.0,
+        "line_items": [{"account_id": "1000", "amount": 10.0, "is_debit": True}],
+    }
+
+    transaction = Transaction.model_validate(row)
+
+    assert isinstance(transaction.line_items[0], TransactionLineItem)
+    assert transaction.currency == "USD"
+
+
+def test_payment_from_attributes_coerces_rows():
+    now = datetime.utcnow()
+    row = SimpleNamespace(id=7, order_id=3, amount=Decimal("5.00"), payment_method="cash",
+                          payment_reference="PAY-1", status="pending", verified_at=None, verified_by=None,
+                          rejection_reason=None, notes=None, created_at=now, updated_at=now)
+
+    payment = Payment.model_validate(row)
+    assert payment.id == 7
+
+    try:
+        Payment.model_validate(SimpleNamespace(**{**vars(row), "order_id": "not-an-id"}))
+        assert False, "invalid rows should be rejected"
+    except ValueError:
+        pass
+
+
+def test_booking_list_adapter_round_trips_rows():
+    now = datetime.utcnow()
+    rows = [
+        SimpleNamespace(id=str(i), customer_id="c1", service_id="s1", start_time=now, end_time=now,
+                        notes=None, status="pending", created_at=now, updated_at=now,
+                        calendar_event_id=None, meeting_link=None)
+        for i in range(3)
+    ]
+
+    payload = json.loads(BOOKING_LIST_ADAPTER.dump_json(BOOKING_LIST_ADAPTER.validate_python(rows, from_attributes=True)))
+
+    assert [b["id"] for b in payload] == [0, 1, 2]
+    assert payload[0]["status"] == "pending"
+
+
+def test_json_object_fields_pass_dicts_through():
+    metadata = {"source": "whatsapp", "tags": [{"k": "v"}]}
+    update = DocumentUpdate(metadata=metadata)
+    assert update.metadata is metadata
+
+    try:
+        DocumentUpdate(metadata=["not", "an", "object"])
+        assert False, "non-object metadata should be rejected"
+    except ValueError:
+        pass
+
+
+def test_streamed_json_matches_single_dump():
+    now = datetime.utcnow()
+    items = BOOKING_LIST_ADAPTER.validate_python([
+        SimpleNamespace(
+            id=str(i), customer_id="c1", service_id="s1", start_time=now, end_time=now, notes=None,
+            status="pending", created_at=now, updated_at=now, calendar_event_id=None, meeting_link=None)
+        for i in range(5)
+    ], from_attributes=True)
+
+    streamed = b"".join(iter_json_list(BOOKING_LIST_ADAPTER, items, chunk_size=2))
+    assert json.loads(streamed) == json.loads(BOOKING_LIST_ADAPTER.dump_json(items))
+    assert json.loads(b"".join(iter_json_list(BOOKING_LIST_ADAPTER, []))) == []
+
+
+if __name__ == "__main__":
+    test_order_response_from_attributes()
+    test_transaction_validates_dicts()
+    test_payment_from_attributes_coerces_rows()
+    test_booking_list_adapter_round_trips_rows()
+    test_json_object_fields_pass_dicts_through()
+    test_streamed_json_matches_single_dump()
+    print("schema tests passed")
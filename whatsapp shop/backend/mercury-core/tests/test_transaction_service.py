@@ -0,0 +1,46 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.models.account import Account, AccountType
+from app.models.transaction import Transaction, TransactionType
+from app.services.transaction import TransactionService
+
+from tests.conftest import setup_db
+
+
+def test_account_statement_running_balance():
+    db = setup_db()
+
+    cash = Account(code="1000", name="Cash", account_type=AccountType.ASSET, balance=0)
+    db.add(cash)
+    db.commit()
+
+    def tx(tx_type, amount, day):
+        return Transaction(journal_entry_id="JE-1", account_id=cash.id, transaction_type=tx_type,
+                           amount=Decimal(amount), transaction_date=datetime(2024, 1, day))
+
+    db.add_all([
+        tx(TransactionType.DEBIT, "100.00", 1),   # before the statement
+        tx(TransactionType.CREDIT, "30.00", 2),   # before the statement
+        tx(TransactionType.DEBIT, "50.00", 10),
+        tx(TransactionType.CREDIT, "20.00", 10),  # same day; ordered by id
+        tx(TransactionType.DEBIT, "5.00", 12),
+    ])
+    db.commit()
+
+    statement = TransactionService.get_account_statement(db, cash.id, datetime(2024, 1, 5), datetime(2024, 1, 31))
+
+    assert statement["opening_balance"] == Decimal("70.00")
+    assert [t["running_balance"] for t in statement["transactions"]] == [
+        Decimal("120.00"), Decimal("100.00"), Decimal("105.00")
+    ]
+    assert statement["closing_balance"] == Decimal("105.00")
+
+    empty = TransactionService.get_account_statement(db, cash.id, datetime(2024, 2, 1), datetime(2024, 2, 28))
+    assert empty["transactions"] == []
+    assert empty["opening_balance"] == empty["closing_balance"] == Decimal("105.00")
+
+
+if __name__ == "__main__":
+    test_account_statement_running_balance()
+    print("transaction service tests passed")
@@ -0,0 +1,27 @@
+"""
+Helpers for building human-readable reference numbers (JE-, ORD-, PAY-, ...).
+"""
+import random
+import secrets
+from datetime import date, datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def _date_prefix(ordinal: int) -> str:
+    """YYYYMMDD for a date ordinal; formatted once per day instead of per call"""
+    return date.fromordinal(ordinal).strftime("%Y%m%d")
+
+
+def generate_reference(prefix: str) -> str:
+    """Build a PREFIX-YYYYMMDD-XXXXXXXX reference with a random hex suffix"""
+    return f"{prefix}-{_date_prefix(date.today().toordinal())}-{secrets.token_hex(4).upper()}"
+
+
+def generate_sequential_reference(prefix: str) -> str:
+    """Build a PREFIX-YYYYMMDD-XXXXXXXXXXXX reference that sorts by creation time"""
+    # Milliseconds since midnight, then 20 bits from the process PRNG (no
+    # syscall); new keys land at the right edge of the unique index
+    now = datetime.now()
+    ms_of_day = ((now.hour * 60 + now.minute) * 60 + now.second) * 1000 + now.microsecond // 1000
+    return f"{prefix}-{_date_prefix(now.toordinal())}-{ms_of_day:07X}{random.getrandbits(20):05X}"
@@ -56,7 +56,7 @@ class LLMParser:
     
     def __init__(self):
         # Regular expressions for simple pattern matching
-        self.patterns = {
+        patterns = {
             CommandType.CREATE_ORDER: [
                 r"(?:order|buy|purchase|get)\s+(\d+)\s*(?:x|of)?\s*([\w\s]+)(?:\s+for\s+\$?(\d+(?:\.\d{2})?))?",
                 r"(?:i\s+want\s+to\s+)?(?:order|buy|purchase|get)\s+(?:a\s+)?([\w\s]+)(?:\s+for\s+\$?(\d+(?:\.\d{2})?))?"
@@ -78,6 +78,11 @@ class LLMParser:
                 r"(?:is|are)\s+([\w\s]+)\s+(?:available|in stock)"
             ]
         }
+        # Compiled once here rather than fetched from re's cache on every parse
+        self.patterns = {
+            command_type: [re.compile(pattern, re.IGNORECASE) for pattern in command_patterns]
+            for command_type, command_patterns in patterns.items()
+        }
         
         # Keywords to identify command types
         self.keywords = {
@@ -88,6 +93,12 @@ class LLMParser:
             CommandType.BOOK_APPOINTMENT: ["book", "schedule", "appointment"],
             CommandType.CHECK_INVENTORY: ["inventory", "stock", "available", "have"]
         }
+        # One alternation per command type: a single scan of the text replaces a
+        # Python loop of substring tests, and dict order still sets the priority
+        self.keyword_patterns = {
+            command_type: re.compile("|".join(re.escape(keyword) for keyword in keywords))
+            for command_type, keywords in self.keywords.items()
+        }
     
     def parse(self, text: str) -> Command:
         """
@@ -106,23 +117,23 @@ class LLMParser:
             return Command(CommandType.UNKNOWN, {}, 0.0, text)
         
         # Check for help command
-        if any(keyword in text for keyword in self.keywords[CommandType.HELP]):
+        if self.keyword_patterns[CommandType.HELP].search(text):
             return Command(CommandType.HELP, {"message": "How can I help you today?"}, 1.0, text)
         
         # Try to match patterns for each command type
         for command_type, patterns in self.patterns.items():
             for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+                match = pattern.search(text)
                 if match:
                     entities = self._extract_entities(command_type, match.groups())
                     return Command(command_type, entities, 0.9, text)
         
         # Fall back to keyword matching with lower confidence
-        for command_type, keywords in self.keywords.items():
+        for command_type, keyword_pattern in self.keyword_patterns.items():
             if command_type == CommandType.HELP:
                 continue
                 
-            if any(keyword in text for keyword in keywords):
+            if keyword_pattern.search(text):
                 return Command(command_type, {"raw_text": text}, 0.7, text)
         
         # If no match found, return unknown command
@@ -0,0 +1,28 @@
+"""
+Keyset (cursor) pagination for newest-first listings.
+"""
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+# (created_at, id) of the last row the client has seen
+Cursor = Tuple[datetime, int]
+
+
+def keyset_page(query, model, cursor: Optional[Cursor], limit: int):
+    """Limit a query to the next newest-first page after cursor; no OFFSET scan"""
+    if cursor is not None:
+        created_at, row_id = cursor
+        query = query.filter(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id)
+        ))
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+
+def next_cursor(rows: Sequence) -> Optional[Cursor]:
+    """Cursor for the page after rows, or None when there are no rows"""
+    if not rows:
+        return None
+    return rows[-1].created_at, rows[-1].id
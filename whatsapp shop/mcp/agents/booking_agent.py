@@ -6,6 +6,10 @@ from .base_agent import BaseAgent, Task, AgentResponse
 
 logger = logging.getLogger(__name__)
 
+
+def _as_datetime(value) -> datetime:
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
 class BookingAgent(BaseAgent):
     """Agent responsible for handling booking-related tasks including calendar integration."""
     
@@ -15,6 +19,8 @@ class BookingAgent(BaseAgent):
             agent_type="booking"
         )
         self.bookings = {}  # In-memory storage (replace with DB in production)
+        # Parsed (start, end) of active bookings, so availability checks don't re-parse ISO strings
+        self._busy_intervals: Dict[str, tuple] = {}
         self.calendar_service = None  # Will be initialized in _setup
     
     async def _setup(self):
@@ -85,6 +91,10 @@ class BookingAgent(BaseAgent):
                 "created_at": datetime.utcnow().isoformat(),
                 "updated_at": datetime.utcnow().isoformat()
             }
+            self._busy_intervals[booking_id] = (
+                _as_datetime(booking_data["start_time"]),
+                _as_datetime(booking_data["end_time"])
+            )
             
             # In a real implementation, create calendar event
             # event = await self.calendar_service.create_event({
@@ -126,6 +136,7 @@ class BookingAgent(BaseAgent):
         #     )
         
         self.bookings[booking_id]["status"] = "cancelled"
+        self._busy_intervals.pop(booking_id, None)
         self.bookings[booking_id]["updated_at"] = datetime.utcnow().isoformat()
         
         logger.info(f"Cancelled booking: {booking_id}")
@@ -190,20 +201,16 @@ class BookingAgent(BaseAgent):
         """Check if a time slot is available for booking."""
         # In a real implementation, this would check against the calendar service
         # For now, we'll just check against our in-memory bookings
-        start = datetime.fromisoformat(start_time) if isinstance(start_time, str) else start_time
-        end = datetime.fromisoformat(end_time) if isinstance(end_time, str) else end_time
+        start = _as_datetime(start_time)
+        end = _as_datetime(end_time)
         
-        for booking in self.bookings.values():
-            if booking["status"] != "cancelled":
-                booking_start = datetime.fromisoformat(booking["start_time"]) if isinstance(booking["start_time"], str) else booking["start_time"]
-                booking_end = datetime.fromisoformat(booking["end_time"]) if isinstance(booking["end_time"], str) else booking["end_time"]
-                
-                # Check for overlap
-                if (start < booking_end and end > booking_start):
-                    return {
-                        "available": False,
-                        "reason": "Time slot overlaps with an existing booking"
-                    }
+        for booking_start, booking_end in self._busy_intervals.values():
+            # Check for overlap
+            if (start < booking_end and end > booking_start):
+                return {
+                    "available": False,
+                    "reason": "Time slot overlaps with an existing booking"
+                }
         
         # If we get here, the slot is available
         return {"available": True}